@@ -0,0 +1,238 @@
+"""Stand-in appleJuice Core serving synthetic data over HTTP.
+
+    python -m benchmarks.fake_core --port 9851 --password secret
+    python -m benchmarks.fake_core --cores 20 --downloads 5000 --latency 0.2 --drop 0.05
+
+Serves /xml/information.xml, /xml/session.xml, /xml/modified.xml with
+sessions and deltas, /xml/share.xml with ETag and /function/* for the
+download and button functions, compressed if the client accepts it. Every request must carry the MD5 of the
+password, like a real core. With --cores N, N independent cores listen
+on consecutive ports.
+
+Faults are injected per request: --latency (+ --jitter) delays the
+answer, --drop closes the connection without answer, --errors answers
+500, and --slow sends the body in --slow-chunk sized parts with that
+many seconds between them.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+
+from aiohttp import web
+
+from .synthetic import SyntheticCore
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_PAUSED = 18
+STATUS_ACTIVE = 0
+STATUS_CANCELLED = 17
+STATUS_FINISHED = (14, 17)
+
+
+class FakeCore:
+    """HTTP front end and fault injection for one SyntheticCore."""
+
+    def __init__(self, core: SyntheticCore, password: str, latency: float = 0.0, jitter: float = 0.0,
+                 drop: float = 0.0, errors: float = 0.0, slow: float = 0.0, slow_chunk: int = 4096,
+                 seed: int = 0):
+        """Init."""
+        self.core = core
+        self.password = hashlib.md5(password.encode()).hexdigest()
+        self.latency = latency
+        self.jitter = jitter
+        self.drop = drop
+        self.errors = errors
+        self.slow = slow
+        self.slow_chunk = slow_chunk
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.dropped = 0
+        self.bytes = 0
+        self.functions = []
+        self.ticks = None
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application of the core."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/xml/information.xml", self.information)
+        app.router.add_get("/xml/session.xml", self.session)
+        app.router.add_get("/xml/modified.xml", self.modified)
+        app.router.add_get("/xml/share.xml", self.share)
+        app.router.add_get("/function/{method}", self.function)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Check the password and inject the configured faults."""
+        self.requests += 1
+        if request.query.get("password") != self.password:
+            raise web.HTTPForbidden(text="wrong password")
+
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.random.random() < self.drop:
+            self.dropped += 1
+            request.transport.close()
+            raise asyncio.CancelledError
+
+        if self.random.random() < self.errors:
+            raise web.HTTPInternalServerError(text="injected error")
+
+        return await handler(request)
+
+    async def _respond(self, request: web.Request, body: bytes, headers=None) -> web.StreamResponse:
+        """Send an XML body, slowly if configured."""
+        self.bytes += len(body)
+        if self.slow <= 0:
+            response = web.Response(body=body, content_type="text/xml", headers=headers)
+            response.enable_compression()
+            return response
+
+        response = web.StreamResponse(headers=headers)
+        response.content_type = "text/xml"
+        response.content_length = len(body)
+        await response.prepare(request)
+        for offset in range(0, len(body), self.slow_chunk):
+            await response.write(body[offset:offset + self.slow_chunk])
+            await asyncio.sleep(self.slow)
+        await response.write_eof()
+        return response
+
+    async def information(self, request: web.Request) -> web.StreamResponse:
+        """Serve information.xml."""
+        return await self._respond(request, self.core.information_xml())
+
+    async def session(self, request: web.Request) -> web.StreamResponse:
+        """Serve session.xml with a new session."""
+        return await self._respond(request, self.core.session_xml())
+
+    async def modified(self, request: web.Request) -> web.StreamResponse:
+        """Serve modified.xml, the delta since the timestamp for a known session.
+
+        An unknown session answers without <time>, like a real core.
+        """
+        try:
+            timestamp = int(request.query.get("timestamp", 0))
+            session = int(request.query["session"]) if "session" in request.query else None
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e)) from e
+
+        if session is not None and session not in self.core.sessions:
+            return await self._respond(request, b'<?xml version="1.0" encoding="UTF-8"?>\n<applejuice></applejuice>')
+
+        filters = request.query["filter"].split(";") if "filter" in request.query else None
+        return await self._respond(request, self.core.modified_xml(timestamp if session is not None else 0, filters))
+
+    async def share(self, request: web.Request) -> web.StreamResponse:
+        """Serve share.xml, 304 if the share did not change since the ETag."""
+        body = self.core.share_xml()
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return await self._respond(request, body, {"ETag": etag})
+
+    async def function(self, request: web.Request) -> web.Response:
+        """Run a core function on the synthetic state."""
+        method = request.match_info["method"]
+        ids = [int(value) for values in request.query.getall("id", []) for value in values.split(",") if value]
+        self.functions.append((method, ids))
+        # the changes need a newer core time than the last delta to show up in the next one
+        self.core.tick(changed=0.0, removed=0.0, seconds=0.001)
+
+        if method == "pausedownload":
+            changed = [self.core.change(object_id, status=STATUS_PAUSED) for object_id in ids]
+        elif method == "resumedownload":
+            changed = [self.core.change(object_id, status=STATUS_ACTIVE) for object_id in ids]
+        elif method == "canceldownload":
+            changed = [self.core.change(object_id, status=STATUS_CANCELLED) for object_id in ids]
+        elif method == "setpowerdownload":
+            powerdownload = int(request.query.get("powerdownload", 0))
+            changed = [self.core.change(object_id, powerdownload=powerdownload) for object_id in ids]
+        elif method == "cleandownloadlist":
+            changed = [self.core.remove(object_id) for object_id, (_, attrib) in list(self.core.downloads.items())
+                       if attrib["status"] in STATUS_FINISHED]
+        elif method == "exitcore":
+            changed = []
+        else:
+            raise web.HTTPNotFound(text=f"unknown function {method}")
+
+        if not all(changed):
+            raise web.HTTPBadRequest(text="unknown id")
+        return web.Response(text="ok")
+
+    async def run_ticks(self, interval: float, changed: float, removed: float) -> None:
+        """Change the synthetic state every interval seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            self.core.tick(changed=changed, removed=removed, seconds=interval)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fake core options to an argument parser."""
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9851, help="port of the first core")
+    parser.add_argument("--cores", type=int, default=1)
+    parser.add_argument("--password", default="applejuice")
+    parser.add_argument("--downloads", type=int, default=100)
+    parser.add_argument("--shares", type=int, default=1000)
+    parser.add_argument("--tick", type=float, default=1.0, help="seconds between state changes")
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of objects changed per tick")
+    parser.add_argument("--removed", type=float, default=0.0, help="fraction of objects removed per tick")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop", type=float, default=0.0, help="fraction of dropped connections")
+    parser.add_argument("--errors", type=float, default=0.0, help="fraction of 500 answers")
+    parser.add_argument("--slow", type=float, default=0.0, help="seconds between body chunks")
+    parser.add_argument("--slow-chunk", type=int, default=4096)
+
+
+async def start(args) -> tuple[list, list]:
+    """Start the fake cores, return the runners and the cores."""
+    runners, cores = [], []
+    for index in range(args.cores):
+        fake = FakeCore(SyntheticCore(downloads=args.downloads, shares=args.shares, seed=index), args.password,
+                        latency=args.latency, jitter=args.jitter, drop=args.drop, errors=args.errors,
+                        slow=args.slow, slow_chunk=args.slow_chunk, seed=index)
+        runner = web.AppRunner(fake.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, args.host, args.port + index).start()
+        if args.tick > 0:
+            fake.ticks = asyncio.create_task(fake.run_ticks(args.tick, args.changed, args.removed))
+        runners.append(runner)
+        cores.append(fake)
+    return runners, cores
+
+
+async def stop(runners, cores) -> None:
+    """Stop the fake cores."""
+    for fake in cores:
+        if fake.ticks is not None:
+            fake.ticks.cancel()
+    for runner in runners:
+        await runner.cleanup()
+
+
+async def main(args) -> None:
+    """Serve the fake cores until interrupted."""
+    runners, cores = await start(args)
+    _LOGGER.warning("%d fake cores listening on %s:%d-%d", len(cores), args.host, args.port, args.port + len(cores) - 1)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop(runners, cores)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(argument_parser)
+    try:
+        asyncio.run(main(argument_parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,175 @@
+"""Load test of N coordinators against N fake cores on one machine.
+
+    python -m benchmarks.load --cores 20 --duration 120 --downloads 5000 --interval 5
+    python -m benchmarks.load --cores 50 --drop 0.05 --slow 0.01 --json result.json
+
+The fake cores run in a child process (see benchmarks.fake_core, whose
+options are accepted here as well), so the measured event loop is only
+the one of Home Assistant. A minimal Home Assistant instance is started
+in a temporary configuration directory, one config entry per fake core
+is set up and polls at a fixed --interval, the speeds every --fast seconds.
+
+Reported are the polls, requests, errors and bytes per second from the
+coordinator telemetry, the state writes per second and the lag of the
+event loop, measured as the oversleep of a --probe seconds sleep.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from custom_components.applejuice_core.const import (
+    DOMAIN,
+    CONF_URL,
+    CONF_PORT,
+    CONF_PASSWORD,
+    CONF_TLS,
+    CONF_OPTION_POLLING_RATE,
+    CONF_OPTION_POLLING_RATE_MIN,
+    CONF_OPTION_POLLING_RATE_MAX,
+    CONF_OPTION_POLLING_RATE_FAST,
+    CONF_OPTION_POLLING_RATE_SLOW,
+)
+from custom_components.applejuice_core.telemetry import RollingWindow
+
+from .fake_core import add_arguments
+
+INTEGRATION = Path(__file__).resolve().parent.parent / "custom_components" / DOMAIN
+
+
+def _start_fake_cores(args) -> subprocess.Popen:
+    """Start the fake cores in a child process and wait until all listen."""
+    command = [sys.executable, "-m", "benchmarks.fake_core"]
+    for name in ("host", "port", "cores", "password", "downloads", "shares", "tick", "changed", "removed",
+                 "latency", "jitter", "drop", "errors", "slow", "slow_chunk"):
+        command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    process = subprocess.Popen(command, cwd=INTEGRATION.parent.parent)
+
+    deadline = time.monotonic() + 60 + args.cores
+    for port in range(args.port, args.port + args.cores):
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("fake cores exited")
+            try:
+                socket.create_connection((args.host, port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    process.terminate()
+                    raise RuntimeError(f"fake core on port {port} did not start")
+                time.sleep(0.2)
+    return process
+
+
+async def _probe_loop(lag: RollingWindow, interval: float) -> None:
+    """Record how much later than requested the event loop wakes up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag.add(loop.time() - start - interval)
+
+
+async def run(args) -> dict:
+    """Run the load test, return the results."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        (Path(config_dir) / "custom_components").mkdir()
+        (Path(config_dir) / "custom_components" / DOMAIN).symlink_to(INTEGRATION)
+
+        hass = HomeAssistant(config_dir)
+        loader.async_setup(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+        await hass.async_start()
+
+        writes = 0
+
+        def count_write(event):
+            nonlocal writes
+            writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_write)
+
+        for index in range(args.cores):
+            entry = config_entries.ConfigEntry(
+                version=1, minor_version=1, domain=DOMAIN, title=f"fake core {index}", source="user",
+                data={CONF_URL: args.host, CONF_PORT: args.port + index, CONF_PASSWORD: args.password,
+                      CONF_TLS: False},
+                options={CONF_OPTION_POLLING_RATE: args.interval, CONF_OPTION_POLLING_RATE_MIN: args.interval,
+                         CONF_OPTION_POLLING_RATE_MAX: args.interval, CONF_OPTION_POLLING_RATE_FAST: args.fast,
+                         CONF_OPTION_POLLING_RATE_SLOW: args.interval},
+            )
+            await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+
+        coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in hass.config_entries.async_entries(DOMAIN)
+                        if entry.entry_id in hass.data[DOMAIN]]
+
+        def totals() -> dict:
+            result = {"polls": 0, "requests": 0, "errors": 0, "bytes": 0}
+            for coordinator in coordinators:
+                result["polls"] += coordinator.telemetry.update_duration.count
+                for endpoint in coordinator.telemetry.endpoints.values():
+                    result["requests"] += endpoint.requests
+                    result["errors"] += endpoint.errors
+                    result["bytes"] += endpoint.bytes
+            return {**result, "writes": writes}
+
+        lag = RollingWindow(max(100, int(args.duration / args.probe)))
+        probe = asyncio.create_task(_probe_loop(lag, args.probe))
+        before = totals()
+        started = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        elapsed = time.perf_counter() - started
+        after = totals()
+        probe.cancel()
+
+        await hass.async_stop()
+
+    return {
+        "cores": args.cores,
+        "coordinators": len(coordinators),
+        "duration": round(elapsed, 1),
+        "per_second": {name: round((after[name] - before[name]) / elapsed, 2) for name in after},
+        "loop_lag": lag.as_dict(),
+        "update_duration": {f"core {index}": coordinator.telemetry.update_duration.as_dict()
+                            for index, coordinator in enumerate(coordinators[:args.cores])},
+    }
+
+
+def main(argv=None) -> int:
+    """Start the fake cores and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to measure")
+    parser.add_argument("--interval", type=int, default=5, help="polling interval of the coordinators")
+    parser.add_argument("--fast", type=int, default=2, help="polling interval of the speeds and network info")
+    parser.add_argument("--probe", type=float, default=0.05, help="seconds between event loop lag probes")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    process = _start_fake_cores(args)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(json.dumps({name: value for name, value in results.items() if name != "update_duration"}, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Micro-benchmarks of the parse, merge, aggregate, progress, share index and value_fn hot paths.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.run                 # compare with the baselines
+    python -m benchmarks.run --save          # store new baselines
+    python -m benchmarks.run --sizes small medium --stages modified_parse
+
+Every stage is timed as the best of --repeat runs and measured once more
+with tracemalloc for its peak memory. The baselines are machine specific
+and stored in benchmarks/baselines.json, which is not committed. A stage
+slower than its baseline by more than --tolerance, or using more memory
+than --memory-tolerance allows, fails the run with exit code 1.
+"""
+
+import argparse
+import gc
+from itertools import islice
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import defusedxml.ElementTree as ET
+
+from custom_components.applejuice_core.binary_sensor import BINARY_SENSORS
+from custom_components.applejuice_core.const import CHUNK_SIZE
+from custom_components.applejuice_core.model import (
+    AppleJuiceState,
+    Aggregate,
+    DeltaCursor,
+    DownloadProgress,
+    ModifiedUpdate,
+    ShareUpdate,
+    diff_snapshots,
+)
+from custom_components.applejuice_core.parser import StreamParser
+from custom_components.applejuice_core.sensor import SENSORS_CORE, SENSORS_NETWORK
+from custom_components.applejuice_core.telemetry import Telemetry
+
+from .synthetic import SyntheticCore
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+SIZES = {
+    "small": {"downloads": 100, "shares": 1000},
+    "medium": {"downloads": 5000, "shares": 20000},
+    "large": {"downloads": 50000, "shares": 200000},
+}
+
+
+def _parse(document: bytes, handler):
+    """Feed a document in response sized chunks to a stream parser."""
+    parser = StreamParser(handler)
+    for offset in range(0, len(document), CHUNK_SIZE):
+        parser.feed(document[offset:offset + CHUNK_SIZE])
+    parser.close()
+    return handler
+
+
+def _synced_state(core: SyntheticCore) -> AppleJuiceState:
+    """Return a state with a full modified.xml and share.xml applied."""
+    state = AppleJuiceState()
+    state.apply_modified(_parse(core.modified_xml(), ModifiedUpdate(True)), DeltaCursor())
+    state.apply_share(_parse(core.share_xml(), ShareUpdate()))
+    state.snapshot()
+    return state
+
+
+def stages(core: SyntheticCore) -> dict:
+    """Return the stages as name: setup, the setup returns the callable to measure."""
+    information = core.information_xml()
+    full = core.modified_xml()
+    shares = core.share_xml()
+    timestamp = core.time
+    core.tick(changed=0.01, removed=0.001)
+    delta = core.modified_xml(timestamp)
+
+    def modified_parse():
+        return lambda: _parse(full, ModifiedUpdate(True))
+
+    def modified_apply():
+        update = _parse(full, ModifiedUpdate(True))
+
+        def run():
+            state = AppleJuiceState()
+            state.apply_modified(update, DeltaCursor())
+            state.snapshot()
+        return run
+
+    def modified_delta():
+        state = _synced_state(core)
+        previous = state.snapshot()
+        cursor = DeltaCursor()
+
+        def run():
+            state.apply_modified(_parse(delta, ModifiedUpdate(False)), cursor)
+            diff_snapshots(previous, state.snapshot())
+        return run
+
+    def download_progress():
+        snapshot = _synced_state(core).snapshot()
+        downloads = snapshot.downloads.values()
+
+        def run():
+            progress = DownloadProgress(Aggregate.of_downloads(downloads), snapshot.downloads, snapshot.download_speeds)
+            for download_id in snapshot.downloads:
+                progress.download_eta(download_id)
+        return run
+
+    def share_parse():
+        return lambda: _parse(shares, ShareUpdate())
+
+    def share_index():
+        builder = _parse(shares, ShareUpdate()).builder
+        return lambda: builder.build()
+
+    def share_query():
+        index = _parse(shares, ShareUpdate()).build()
+        checksums = [index.checksum(position) for position in range(0, len(index), 97)]
+        filenames = [index.filename(position) for position in range(0, len(index), 97)]
+
+        def run():
+            for checksum, filename in zip(checksums, filenames):
+                index.find_checksum(checksum)
+                index.find_path(filename)
+            list(islice(index.largest(), 100))
+            list(islice(index.in_directory("/media/share"), 100))
+        return run
+
+    def share_aggregate():
+        index = _parse(shares, ShareUpdate()).build()
+        return lambda: Aggregate.of_shares(index)
+
+    def information_parse():
+        return lambda: ET.fromstring(information).find("generalinformation")
+
+    def value_fn():
+        sensor = SimpleNamespace(coordinator=SimpleNamespace(data=_synced_state(core).snapshot(),
+                                                             telemetry=Telemetry()))
+        descriptions = [*SENSORS_CORE, *SENSORS_NETWORK, *BINARY_SENSORS]
+
+        def run():
+            for description in descriptions:
+                description.value_fn(sensor)
+        return run
+
+    return {
+        "information_parse": information_parse,
+        "modified_parse": modified_parse,
+        "modified_apply": modified_apply,
+        "modified_delta": modified_delta,
+        "download_progress": download_progress,
+        "share_parse": share_parse,
+        "share_index": share_index,
+        "share_query": share_query,
+        "share_aggregate": share_aggregate,
+        "value_fn": value_fn,
+    }
+
+
+def measure(setup, repeat: int) -> dict:
+    """Return the best time in seconds and the peak memory in KiB of a stage."""
+    best = None
+    for _ in range(repeat):
+        run = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    run = setup()
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": round(best, 6), "peak_kib": round(peak / 1024, 1)}
+
+
+def compare(results: dict, baselines: dict, tolerance: float, memory_tolerance: float) -> list:
+    """Return the regressions of the results against the baselines."""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["seconds"] > baseline["seconds"] * (1 + tolerance):
+            regressions.append(f"{name}: {result['seconds']:.6f}s, baseline {baseline['seconds']:.6f}s")
+        if result["peak_kib"] > baseline["peak_kib"] * (1 + memory_tolerance) + 1:
+            regressions.append(f"{name}: {result['peak_kib']} KiB, baseline {baseline['peak_kib']} KiB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(SIZES))
+    parser.add_argument("--stages", nargs="+", help="only run these stages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="allowed relative memory growth")
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="store the results as new baselines")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        core = SyntheticCore(**SIZES[size])
+        for stage, setup in stages(core).items():
+            if args.stages and stage not in args.stages:
+                continue
+            name = f"{size}/{stage}"
+            results[name] = measure(setup, args.repeat)
+            print(f"{name:32} {results[name]['seconds'] * 1000:10.2f} ms {results[name]['peak_kib']:12.1f} KiB")
+
+    baselines = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+
+    if args.save:
+        baselines.update(results)
+        args.baselines.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"baselines saved to {args.baselines}")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
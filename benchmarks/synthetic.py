@@ -0,0 +1,229 @@
+"""Synthetic appleJuice Core XML for benchmarks and the fake core.
+
+The generated documents follow the layout of a real core: modified.xml
+with <time>, <information>, <networkinfo>, the object elements and
+<removed>, share.xml with <shares> and information.xml with
+<generalinformation>. All values come from a seeded random generator,
+so the same arguments always produce the same bytes.
+"""
+
+import random
+from xml.sax.saxutils import escape, quoteattr
+
+FILTERS = ("informations", "down", "user", "uploads", "server")
+
+START_TIME = 1_700_000_000_000
+
+EXTENSIONS = ("mkv", "avi", "mp3", "flac", "iso", "zip", "pdf", "epub")
+WORDS = ("apple", "juice", "core", "linux", "debian", "holiday", "concert", "live", "remastered",
+         "season", "episode", "Übersicht", "Grüße", "R&D", "documentary", "collection")
+DIRECTORIES = ("/media/share", "/media/share/music", "/media/share/video", "/media/share/books",
+               "/home/juice/incoming", "/home/juice/incoming/done")
+
+# active, finishing, ready, creating, paused; weighted like a busy core
+DOWNLOAD_STATUSES = (0, 0, 0, 0, 0, 0, 12, 14, 14, 16, 18, 18)
+
+
+def _attrs(**attrib) -> str:
+    """Return the attributes of an element."""
+    return " ".join(f"{name}={quoteattr(str(value))}" for name, value in attrib.items())
+
+
+class SyntheticCore:
+    """Deterministic in-memory core that renders its state as XML.
+
+    tick() advances the core time and changes a part of the downloads,
+    users and uploads, so modified.xml with a timestamp only contains the
+    objects changed or removed after it, like the delta of a real core.
+    """
+
+    def __init__(self, downloads: int = 100, shares: int = 1000, uploads: int | None = None,
+                 users: int | None = None, servers: int = 20, seed: int = 0):
+        """Init."""
+        self.random = random.Random(seed)
+        self.time = START_TIME
+        self.version = "0.31.149.110"
+        self.system = "Linux"
+        self.sessions = set()
+        self.modified_at = {}
+        self.removed_at = {}
+        self._next_id = 1
+
+        self.information = {
+            "credits": 0, "sessionupload": 0, "sessiondownload": 0, "uploadspeed": 0,
+            "downloadspeed": 0, "openconnections": 0, "maxuploadpositions": 5,
+        }
+        self.servers = {}
+        for _ in range(servers):
+            self._add("server", self.servers, self._server())
+        self.networkinfo = {
+            "users": 250000, "files": 18000000, "filesize": "4711,5", "firewalled": "false",
+            "paused": "false", "ip": "192.0.2.1",
+            "connectedwithserverid": next(iter(self.servers), -1), "connectedsince": START_TIME - 3600000,
+        }
+
+        self.shares = [self._share(index) for index in range(shares)]
+        self.downloads = {}
+        for _ in range(downloads):
+            self._add("download", self.downloads, self._download())
+        self.uploads = {}
+        for _ in range(downloads // 10 if uploads is None else uploads):
+            self._add("upload", self.uploads, self._upload())
+        self.users = {}
+        download_ids = list(self.downloads)
+        for _ in range(downloads if users is None else users):
+            self._add("user", self.users, self._user(download_ids))
+        self._update_information()
+
+    def _add(self, tag, objects, attrib) -> None:
+        """Add an object with a new id."""
+        attrib["id"] = self._next_id
+        objects[self._next_id] = (tag, attrib)
+        self.modified_at[self._next_id] = self.time
+        self._next_id += 1
+
+    def _name(self) -> str:
+        """Return a random file name."""
+        words = self.random.sample(WORDS, self.random.randint(2, 5))
+        return f"{' '.join(words)} {self.random.randint(1, 999)}.{self.random.choice(EXTENSIONS)}"
+
+    def _server(self) -> dict:
+        """Return the attributes of a random server."""
+        number = self._next_id
+        return {"name": f"Server {number}", "host": f"server{number}.example.org", "port": 9855,
+                "lastseen": START_TIME - self.random.randint(0, 86400000)}
+
+    def _download(self) -> dict:
+        """Return the attributes of a random download."""
+        size = self.random.randint(1, 8 * 1024 ** 3)
+        status = self.random.choice(DOWNLOAD_STATUSES)
+        ready = size if status == 14 else self.random.randint(0, size)
+        return {"shareid": 0, "hash": f"{self.random.getrandbits(128):032x}", "filename": self._name(),
+                "size": size, "ready": ready, "status": status, "powerdownload": self.random.randint(0, 49)}
+
+    def _upload(self) -> dict:
+        """Return the attributes of a random upload."""
+        return {"shareid": self.random.randint(1, max(1, len(self.shares))),
+                "nick": f"juicer{self.random.randint(1, 99999)}", "status": self.random.choice((1, 1, 2)),
+                "priority": self.random.randint(1, 250), "speed": self.random.randint(0, 512 * 1024)}
+
+    def _user(self, download_ids) -> dict:
+        """Return the attributes of a random source of a download."""
+        return {"downloadid": self.random.choice(download_ids) if download_ids else -1,
+                "nickname": f"juicer{self.random.randint(1, 99999)}", "status": self.random.choice((5, 5, 7)),
+                "speed": self.random.randint(0, 256 * 1024)}
+
+    def _share(self, index) -> dict:
+        """Return the attributes of a shared file."""
+        return {"id": index + 1, "filename": f"{self.random.choice(DIRECTORIES)}/{self._name()}",
+                "checksum": f"{self.random.getrandbits(128):032x}",
+                "size": self.random.randint(1, 4 * 1024 ** 3), "priority": self.random.randint(1, 250)}
+
+    def _update_information(self) -> None:
+        """Derive the speeds of the core from its uploads and users."""
+        self.information["uploadspeed"] = sum(attrib["speed"] for _, attrib in self.uploads.values())
+        self.information["downloadspeed"] = sum(attrib["speed"] for _, attrib in self.users.values())
+        self.information["openconnections"] = len(self.users) + len(self.uploads)
+        self.information["sessionupload"] += self.information["uploadspeed"]
+        self.information["sessiondownload"] += self.information["downloadspeed"]
+        self.information["credits"] += self.information["uploadspeed"] - self.information["downloadspeed"] // 2
+
+    def tick(self, changed: float = 0.01, removed: float = 0.0, seconds: float = 1.0) -> None:
+        """Advance the core time and change a fraction of its objects."""
+        self.time += int(seconds * 1000)
+        for objects in (self.downloads, self.uploads, self.users):
+            if not objects:
+                continue
+            count = min(len(objects), max(1, int(len(objects) * changed)))
+            for object_id in self.random.sample(list(objects), count):
+                tag, attrib = objects[object_id]
+                if tag == "download":
+                    attrib["ready"] = min(attrib["size"], attrib["ready"] + self.random.randint(0, 4 * 1024 ** 2))
+                    if attrib["ready"] == attrib["size"]:
+                        attrib["status"] = 14
+                else:
+                    attrib["speed"] = self.random.randint(0, 256 * 1024)
+                self.modified_at[object_id] = self.time
+            for object_id in self.random.sample(list(objects), int(len(objects) * removed)):
+                del objects[object_id]
+                self.modified_at.pop(object_id, None)
+                self.removed_at[object_id] = self.time
+        self._update_information()
+
+    def find(self, object_id: int):
+        """Return the (tag, attributes) of an object, None if it does not exist."""
+        for objects in (self.downloads, self.uploads, self.users, self.servers):
+            if object_id in objects:
+                return objects[object_id]
+        return None
+
+    def change(self, object_id: int, **attrib) -> bool:
+        """Change attributes of an object, False if it does not exist."""
+        found = self.find(object_id)
+        if found is None:
+            return False
+        found[1].update(attrib)
+        self.modified_at[object_id] = self.time
+        return True
+
+    def remove(self, object_id: int) -> bool:
+        """Remove an object, False if it does not exist."""
+        for objects in (self.downloads, self.uploads, self.users, self.servers):
+            if objects.pop(object_id, None) is not None:
+                self.modified_at.pop(object_id, None)
+                self.removed_at[object_id] = self.time
+                return True
+        return False
+
+    def information_xml(self) -> bytes:
+        """Return information.xml."""
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<applejuice><generalinformation>'
+            f"<filesystem seperator=\"/\"/><version>{escape(self.version)}</version>"
+            f"<system>{escape(self.system)}</system></generalinformation></applejuice>"
+        ).encode()
+
+    def session_xml(self) -> bytes:
+        """Return session.xml with a new session id."""
+        session = self.random.randint(1, 2 ** 31)
+        self.sessions.add(session)
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<applejuice><session id="{session}"/></applejuice>'.encode()
+
+    def modified_xml(self, timestamp: int = 0, filters=None) -> bytes:
+        """Return modified.xml with everything changed after the timestamp.
+
+        filters is an iterable of the modified.xml filter names, None
+        returns all sections.
+        """
+        filters = set(FILTERS if filters is None else filters)
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<applejuice>', f"<time>{self.time}</time>"]
+
+        if "informations" in filters:
+            parts.append(f"<information {_attrs(**self.information)}/>")
+            parts.append(f"<networkinfo {_attrs(**self.networkinfo)}><welcomemessage>"
+                         "Welcome to the synthetic core</welcomemessage></networkinfo>")
+
+        for name, objects in (("down", self.downloads), ("user", self.users),
+                              ("uploads", self.uploads), ("server", self.servers)):
+            if name not in filters:
+                continue
+            for object_id, (tag, attrib) in objects.items():
+                if self.modified_at.get(object_id, 0) > timestamp or not timestamp:
+                    parts.append(f"<{tag} {_attrs(**attrib)}/>")
+
+        if timestamp:
+            removed = [object_id for object_id, at in self.removed_at.items() if at > timestamp]
+            if removed:
+                parts.append("<removed>")
+                parts.extend(f'<object id="{object_id}"/>' for object_id in removed)
+                parts.append("</removed>")
+
+        parts.append("</applejuice>")
+        return "".join(parts).encode()
+
+    def share_xml(self) -> bytes:
+        """Return share.xml."""
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<applejuice><shares>']
+        parts.extend(f"<share {_attrs(**attrib)}/>" for attrib in self.shares)
+        parts.append("</shares></applejuice>")
+        return "".join(parts).encode()
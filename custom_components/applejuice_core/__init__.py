@@ -2,30 +2,65 @@
 
 import asyncio
 import logging
+import time
+from collections import Counter
 from datetime import timedelta
-import xml.etree.ElementTree as ET
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from .const import (
     DOMAIN,
     CONF_URL,
     CONF_PORT,
-    CONF_PASSWORD,
-    CONF_TLS,
     PLATFORMS,
     CONF_OPTION_POLLING_RATE,
+    CONF_OPTION_POLLING_RATE_MIN,
+    CONF_OPTION_POLLING_RATE_MAX,
+    CONF_OPTION_POLLING_RATE_FAST,
+    CONF_OPTION_POLLING_RATE_SLOW,
+    CONF_OPTION_EXECUTOR_THRESHOLD,
+    DEFAULT_EXECUTOR_THRESHOLD,
+    DEFAULT_POLLING_RATE,
+    DEFAULT_POLLING_RATE_MIN,
+    DEFAULT_POLLING_RATE_MAX,
+    DEFAULT_POLLING_RATE_FAST,
+    DEFAULT_POLLING_RATE_SLOW,
+    LANE_SLACK,
+    LIVE_BACKOFF_MAX,
+    ENDPOINT_TIMEOUTS,
+    COMMAND_REFRESH_COOLDOWN,
+    LOOP_BUSY_LIMIT,
+    POLL_TIMEOUT,
 )
 
-from .api import get_xml_data
-
-SCAN_INTERVAL = timedelta(seconds=30)
+from .api import AppleJuiceClient, ResponseCache
+from .model import (
+    AppleJuiceState,
+    DeltaCursor,
+    ModifiedUpdate,
+    ShareUpdate,
+    ALL_SECTIONS,
+    SHARE_SECTIONS,
+    diff_snapshots,
+    modified_filter,
+)
+from .commands import DownloadCommands
+from .events import download_events, event_sections, network_events
+from .fleet import async_get_fleet
+from .parser import StreamParser
+from .scheduler import BREAKER_CLOSED, BREAKER_HALF_OPEN, AdaptiveInterval, CircuitBreaker, Lane, is_active
+from .services import async_setup_services
+from .storage import SnapshotStore, restore_state, snapshot_to_dict
+from .telemetry import Telemetry
+from .throughput import Throughput
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +76,8 @@ CONFIG_SCHEMA = vol.Schema(
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the appleJuice Core integration."""
     hass.data.setdefault(DOMAIN, {})
+    async_get_fleet(hass)
+    async_setup_services(hass)
     return True
 
 
@@ -72,6 +109,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     if unloaded:
         hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.fleet.remove(entry.entry_id)
+        coordinator.commands.cancel()
+        coordinator.section_refresher.async_cancel()
+        # a pending save written later would bring back the snapshot of a removed entry
+        await coordinator.store.async_close()
+        await coordinator.client.close()
 
     return unloaded
 
@@ -79,24 +122,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up this integration using UI."""
 
-    global SCAN_INTERVAL
-
     if hass.data.get(DOMAIN) is None:
         hass.data.setdefault(DOMAIN, {})
 
-    if entry.options.get(CONF_OPTION_POLLING_RATE) is not None:
-        SCAN_INTERVAL = timedelta(seconds=entry.options.get(CONF_OPTION_POLLING_RATE))
-    else:
-        SCAN_INTERVAL = timedelta(seconds=30)
-
-    coordinator = AppleJuiceCoordinator(hass, config_entry=entry)
-
-    await coordinator.async_config_entry_first_refresh()
+    client = AppleJuiceClient.from_config(hass, entry.data)
+    coordinator = AppleJuiceCoordinator(hass, config_entry=entry, client=client)
 
-    await coordinator.async_refresh()
-
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    # with a stored snapshot the entities start from it, the core is fetched in the background
+    if not await coordinator.async_restore():
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await client.close()
+            raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -105,38 +143,103 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # all enabled entities are added now, fetch only what they subscribed to
+    coordinator.subscriptions_complete = True
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    async def _async_close_client(event: Event) -> None:
+        await client.close()
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_client))
+
+    if coordinator.restored:
+        entry.async_create_background_task(hass, coordinator.async_refresh_restored(),
+                                           f"{coordinator.name} refresh of the restored snapshot")
+
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot of a deleted entry."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+
+
+def _build_lanes(options) -> list:
+    """Return the polling lanes: live speeds, transfers, servers and shares."""
+    base = options.get(CONF_OPTION_POLLING_RATE, DEFAULT_POLLING_RATE)
+    minimum = options.get(CONF_OPTION_POLLING_RATE_MIN, DEFAULT_POLLING_RATE_MIN)
+    maximum = options.get(CONF_OPTION_POLLING_RATE_MAX, DEFAULT_POLLING_RATE_MAX)
+    fast = options.get(CONF_OPTION_POLLING_RATE_FAST, DEFAULT_POLLING_RATE_FAST)
+    slow = options.get(CONF_OPTION_POLLING_RATE_SLOW, DEFAULT_POLLING_RATE_SLOW)
+
+    return [
+        Lane("live", ("information", "networkinfo"), _async_update_modified,
+             AdaptiveInterval(fast, fast, fast * LIVE_BACKOFF_MAX)),
+        Lane("transfers", ("download", "user", "upload"), _async_update_modified,
+             AdaptiveInterval(base, minimum, maximum)),
+        Lane("servers", ("server",), _async_update_modified,
+             AdaptiveInterval(slow, slow, max(slow, maximum))),
+        Lane("shares", SHARE_SECTIONS, _async_update_share,
+             AdaptiveInterval(slow, slow, max(slow, maximum))),
+    ]
+
+
 class AppleJuiceCoordinator(DataUpdateCoordinator):
     """Handles periodic XML data retrieval."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, client: AppleJuiceClient):
         """Initialize the coordinator with update interval settings."""
+        self.client = client
         self.system = None
         self.version = None
         self.platforms = []
-        self.updaters = [
-            _async_update_modified,
-            _async_update_share,
-        ]
+        self.fleet = async_get_fleet(hass)
+        self.state = AppleJuiceState()
+        self.subscriptions = Counter()
+        self.subscriptions_complete = False
+        self.plan = ALL_SECTIONS
+        self.pending_sections = set()
+        self.commands = DownloadCommands(self)
+        self.changes = None
+        self.changed_downloads = None
+        self.skipped_writes = 0
+        self.skipped_writes_total = 0
+        self.suppressed_writes = Counter()
+        self._notified_success = None
+        self._refresh_lock = asyncio.Lock()
+        self.telemetry = Telemetry()
+        self.throughput = Throughput()
+        self.loop_busy = 0.0
+        self.loop_busy_max = 0.0
+        self.offloaded = False
+        self._loop_busy = 0.0
+        self.executor_threshold = config_entry.options.get(CONF_OPTION_EXECUTOR_THRESHOLD,
+                                                           DEFAULT_EXECUTOR_THRESHOLD) * 1024
+        self.lanes = _build_lanes(config_entry.options)
+        self.executor_thresholds = {lane.name: self.executor_threshold for lane in self.lanes}
+        self.fleet.add(config_entry.entry_id, min(lane.interval.minimum for lane in self.lanes))
+        self.breaker = CircuitBreaker()
+        self.core_reached = False
+        self.response_caches = {
+            "/xml/share.xml": ResponseCache(),
+        }
+        self.store = SnapshotStore(hass, config_entry.entry_id)
+        self.restored = False
         self.hass = hass
         self.config_entry = config_entry
 
         self.name = f"appleJuice Core {config_entry.data.get(CONF_URL)}:{config_entry.data.get(CONF_PORT)}"
 
-        super().__init__(hass, _LOGGER, name=self.name, update_interval=SCAN_INTERVAL, always_update=False)
+        super().__init__(hass, _LOGGER, name=self.name, update_interval=timedelta(seconds=LANE_SLACK),
+                         always_update=False)
+
+        self.section_refresher = Debouncer(hass, _LOGGER, cooldown=COMMAND_REFRESH_COOLDOWN, immediate=False,
+                                           function=self.async_refresh)
 
     async def _async_setup(self):
         """Fetch general device information (version and system)."""
-        xml_data = await get_xml_data(self.hass,
-                                      self.config_entry.data.get(CONF_URL),
-                                      self.config_entry.data.get(CONF_PORT),
-                                      self.config_entry.data.get(CONF_PASSWORD),
-                                      self.config_entry.data.get(CONF_TLS),
-                                      "/xml/information.xml")
+        xml_data = await self.client.get_xml_data("/xml/information.xml")
 
         if xml_data is not None:
             general_info = xml_data.find("generalinformation")
@@ -150,34 +253,416 @@ class AppleJuiceCoordinator(DataUpdateCoordinator):
         else:
             _LOGGER.debug("/xml/information.xml xml data not found")
 
+    async def async_restore(self) -> bool:
+        """Start from the stored snapshot, return False if there is none."""
+        data = await self.store.async_load()
+        if data is None:
+            return False
+
+        self.version = data.get("version")
+        self.system = data.get("system")
+        restore_state(self.state, data)
+        self.data = self.state.snapshot()
+        self.restored = True
+        _LOGGER.debug("%s: restored the stored snapshot", self.name)
+        return True
+
+    async def async_refresh_restored(self) -> None:
+        """Replace the restored snapshot with live data, including version and system of the device."""
+        version, system = self.version, self.system
+        await self._async_setup()
+
+        if (self.version, self.system) != (version, system):
+            device_registry = dr.async_get(self.hass)
+            device = device_registry.async_get_device(identifiers={(DOMAIN, self.config_entry.entry_id)})
+            if device is not None:
+                device_registry.async_update_device(device.id, sw_version=self.version, hw_version=self.system)
+
+        await self.async_refresh()
+
+    @callback
+    def _stored_snapshot(self) -> dict | None:
+        """Return the stored form of the current snapshot, None before the first one."""
+        if self.data is None:
+            return None
+        return snapshot_to_dict(self.version, self.system, self.data)
+
+    @callback
+    def async_subscribe(self, subscriptions) -> CALLBACK_TYPE:
+        """Register the subscriptions of an entity, returns the unsubscribe callback."""
+        sections = {subscription[0] for subscription in subscriptions}
+        self.subscriptions.update(sections)
+
+        @callback
+        def unsubscribe() -> None:
+            self.subscriptions.subtract(sections)
+
+        return unsubscribe
+
+    @property
+    def fetch_plan(self) -> frozenset:
+        """Return the sections needed by the enabled entities and the events with listeners.
+
+        Until the platforms are set up everything is fetched.
+        """
+        if not self.subscriptions_complete:
+            return ALL_SECTIONS
+        subscribed = frozenset(section for section, count in self.subscriptions.items() if count > 0)
+        return subscribed.union(event_sections(self.hass))
+
+    async def async_request_sections(self, sections) -> None:
+        """Request these sections with the next poll, e.g. after a command changed them.
+
+        The debounced refresh waits for a running poll, the sections are
+        taken by whichever poll starts next.
+        """
+        self.pending_sections.update(sections)
+        await self.section_refresher.async_call()
+
     async def _async_update_data(self):
-        """Update data via library."""
-        combined_data = ET.Element("root")
+        """Update data via library, within a poll slot of the fleet scheduler.
+
+        While the circuit breaker is open no request is sent and the
+        entities are unavailable. Once it is half-open a short probe
+        decides whether the core is polled again. Only a request that
+        reached the core counts as success, a poll without due lanes
+        does not, and fails again while the last one failed.
+        """
+        breaker = self.breaker
+        if not breaker.allow(self.hass.loop.time() + LANE_SLACK):
+            self.pending_sections.clear()
+            self._wait_for_breaker()
+            raise UpdateFailed(f"{self.name} is unreachable, next probe in {self.update_interval.seconds}s")
+
+        probed = breaker.state == BREAKER_HALF_OPEN
+        if probed and not await self.client.probe():
+            self._breaker_failed()
+            raise UpdateFailed(f"{self.name} is unreachable, next probe in {self.update_interval.seconds}s")
+
+        try:
+            async with self.fleet.poll(self.config_entry.entry_id):
+                start = time.perf_counter()
+                try:
+                    data = await self._async_poll()
+                finally:
+                    self.telemetry.update_duration.add(time.perf_counter() - start)
+                    self.telemetry.loop_busy.add(self._loop_busy)
+        except UpdateFailed:
+            self._breaker_failed()
+            raise
+
+        if probed or self.core_reached:
+            breaker.record_success()
+        elif not self.last_update_success or breaker.state != BREAKER_CLOSED:
+            raise UpdateFailed(f"{self.name} did not answer since the last failed poll")
+        return data
+
+    def _breaker_failed(self) -> None:
+        """Count a failed poll or probe, and wait for the next probe if the breaker opened."""
+        self.breaker.record_failure(self.hass.loop.time())
+        if self.breaker.open:
+            _LOGGER.debug("%s: circuit breaker open for %ss", self.name, self.breaker.backoff)
+            self._wait_for_breaker()
+
+    def _wait_for_breaker(self) -> None:
+        """Schedule the next refresh when the breaker turns half-open."""
+        self.update_interval = timedelta(seconds=max(self.breaker.retry_in(self.hass.loop.time()), LANE_SLACK))
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh data, and update the telemetry listeners when the data itself did not change.
+
+        Refreshes never overlap: the scheduled one, the refresh of a restored
+        snapshot and the ones requested by commands share the lanes, their
+        cursors and the state, so they run one after another.
+        """
+        async with self._refresh_lock:
+            previous, previous_success = self.data, self.last_update_success
+            await super()._async_refresh(*args, **kwargs)
+            if self.data is previous and self.last_update_success and previous_success and self.changes:
+                self.async_update_listeners()
+
+    async def _async_poll(self):
+        """Poll the lanes that are due and the pending sections of the other lanes.
+
+        The lanes are fetched concurrently within POLL_TIMEOUT. Sections of
+        a lane that failed or ran out of time keep their last good data and
+        are marked stale in the snapshot. Afterwards every polled lane is
+        rescheduled and the coordinator waits for the next one due. If no
+        lane answered at all the poll failed.
+        """
+        pending = frozenset(self.pending_sections)
+        self.pending_sections.clear()
+        loaded = frozenset(self.state.loaded)
+        now = self.hass.loop.time()
+        due = [lane for lane in self.lanes if lane.due <= now + LANE_SLACK]
+        lanes = due + [lane for lane in self.lanes if lane not in due and lane.sections.intersection(pending)]
+
+        self.plan = self.fetch_plan.intersection(pending.union(*(lane.sections for lane in due)))
+        self.offloaded = False
+        self._loop_busy = 0.0
+        self.core_reached = False
+
+        tasks = {
+            asyncio.create_task(lane.updater(self, lane)): lane
+            for lane in lanes
+            if self.plan.intersection(lane.sections)
+        }
+
+        stale = set()
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=POLL_TIMEOUT)
+
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+            for task, lane in tasks.items():
+                if task in pending:
+                    _LOGGER.warning("%s: poll budget of %ss exceeded, keep last %s", self.name, POLL_TIMEOUT, lane.name)
+                elif task.exception() is not None:
+                    _LOGGER.error("%s: error while updating %s: %s", self.name, lane.name, task.exception())
+                elif task.result():
+                    continue
+                stale.update(self.plan.intersection(lane.sections))
+
+        # sections outside the plan were not polled and keep their stale flag
+        self.state.stale = frozenset(stale).union(self.state.stale.difference(self.plan))
+
+        snapshot = await self._async_publish()
+        active = stale != self.plan and is_active(snapshot)
+        self._async_fire_events(snapshot, loaded)
+
+        now = self.hass.loop.time()
+        if "information" in self.plan and "information" not in stale:
+            throughput_changes = self._run_on_loop(self.throughput.add, now, snapshot.information)
+            if self.changes is not None:
+                self.changes |= throughput_changes
+
+        if stale != self.plan:
+            self.restored = False
+
+        for lane in lanes:
+            lane.schedule(now, active)
+        self.update_interval = timedelta(seconds=max(min(lane.due for lane in self.lanes) - now, LANE_SLACK))
+
+        if tasks and stale == self.plan:
+            raise UpdateFailed(f"{self.name} did not answer")
+        self.core_reached = bool(tasks)
+
+        # only a successful poll is stored, its snapshot is self.data by the time the save runs
+        if self.changes is None or any(change[0] not in ("telemetry", "throughput") for change in self.changes):
+            self.store.async_schedule_save(self._stored_snapshot)
+
+        return snapshot
+
+    async def _async_publish(self):
+        """Build the snapshot and remember what changed for the listener dispatch.
+
+        After a payload was parsed in the executor the aggregation runs
+        there too, only the finished snapshot is handled on the loop.
+        """
+        if self.offloaded:
+            snapshot = await self.hass.async_add_executor_job(self.state.snapshot)
+        else:
+            snapshot = self._run_on_loop(self.state.snapshot)
 
-        for updater in self.updaters:
-            xml_data = await updater(self)
-            if xml_data is not None:
-                for child in xml_data:
-                    combined_data.append(child)
+        self.changed_downloads = self.state.take_changed_downloads()
+        if self.data is not None:
+            self.changes = self._run_on_loop(diff_snapshots, self.data, snapshot,
+                                             self.changed_downloads) | {("telemetry",)}
+        else:
+            self.changes = None
+
+        self.loop_busy = self._loop_busy
+        self.loop_busy_max = max(self.loop_busy_max, self.loop_busy)
+        _LOGGER.debug("%s: update kept the event loop busy for %.3fs (offloaded: %s)",
+                      self.name, self.loop_busy, self.offloaded)
+
+        return snapshot
+
+    @callback
+    def _async_fire_events(self, snapshot, loaded) -> None:
+        """Fire the events of the download and connection transitions since the last snapshot.
+
+        Sections that were not loaded from the core before, e.g. only
+        restored from storage, have no transitions yet.
+        """
+        previous = self.data
+        if previous is None:
+            return
+
+        events = []
+        if "download" in loaded:
+            events += self._run_on_loop(list, download_events(previous, snapshot, self.changed_downloads))
+        if "networkinfo" in loaded:
+            events += network_events(previous, snapshot)
+
+        for event_type, data in events:
+            _LOGGER.debug("%s: %s %s", self.name, event_type, data)
+            self.hass.bus.async_fire(event_type, {"config_entry_id": self.config_entry.entry_id, **data})
+
+    def _run_on_loop(self, target, *args):
+        """Run target on the event loop and account the time as loop busy time."""
+        start = time.perf_counter()
+        try:
+            return target(*args)
+        finally:
+            self._loop_busy += time.perf_counter() - start
+
+    def _account_request(self, lane: Lane, endpoint: str, parser: StreamParser, success: bool,
+                         latency: float) -> None:
+        """Record the request telemetry, account the parse time spent on the loop.
+
+        If parsing kept the loop busy for too long, the executor threshold
+        of the lane is halved. Once the parse rate lets twice the threshold
+        be parsed within LOOP_BUSY_LIMIT it is doubled again, up to the
+        configured one.
+        """
+        self.telemetry.endpoint(endpoint).record(success, latency, parser)
+        self._loop_busy += parser.loop_busy
+        self.offloaded |= parser.offloaded
+
+        threshold = self.executor_thresholds[lane.name]
+        if parser.loop_busy > LOOP_BUSY_LIMIT:
+            self.executor_thresholds[lane.name] = min(threshold, parser.size) // 2
+            _LOGGER.debug("%s: parsing %s took %.3fs on the loop, executor threshold of %s lowered to %d bytes",
+                          self.name, endpoint, parser.loop_busy, lane.name, self.executor_thresholds[lane.name])
+        elif threshold < self.executor_threshold and parser.busy * 2 * threshold < LOOP_BUSY_LIMIT * parser.size:
+            self.executor_thresholds[lane.name] = min(threshold * 2, self.executor_threshold)
+            _LOGGER.debug("%s: parsing %s is fast again, executor threshold of %s raised to %d bytes",
+                          self.name, endpoint, lane.name, self.executor_thresholds[lane.name])
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose subscriptions are affected by the last changes.
+
+        Listeners without context, the first data and a change of the
+        update success (availability) still update every listener. The
+        telemetry pseudo section alone does not update listeners without
+        context, it changes on every poll.
+        """
+        changes = self.changes
+        if self.last_update_success != self._notified_success:
+            changes = None
+        self._notified_success = self.last_update_success
+
+        changed_sections = {change[0] for change in changes} if changes is not None else None
+        data_changed = changed_sections is None or bool(changed_sections - {"telemetry"})
+        skipped = written = 0
+
+        for update_callback, context in list(self._listeners.values()):
+            if changes is None or (context is None and data_changed) \
+                    or (context is not None and _is_affected(context, changes, changed_sections)):
+                update_callback()
+                written += 1
+            else:
+                skipped += 1
+
+        self.telemetry.entities_written.add(written)
+        self.skipped_writes = skipped
+        self.skipped_writes_total += skipped
+        _LOGGER.debug("%s: %d listeners skipped, changes: %s", self.name, skipped, changes)
+
+
+def _is_affected(subscriptions, changes, changed_sections) -> bool:
+    """Return True if one of the subscriptions matches the changes.
+
+    (section,) matches any change of the section, (section, attribute)
+    the attribute itself or a change of the whole section.
+    """
+    for subscription in subscriptions:
+        if len(subscription) == 1:
+            if subscription[0] in changed_sections:
+                return True
+        elif subscription in changes or subscription[:1] in changes:
+            return True
+    return False
+
+
+async def _async_update_session(self, cursor: DeltaCursor):
+    """Request a new session from the core for delta updates of modified.xml."""
+    xml_data = await self.client.get_xml_data("/xml/session.xml")
+
+    session = xml_data.find("session") if xml_data is not None else None
+
+    if session is not None:
+        cursor.session = session.attrib.get("id")
+    else:
+        _LOGGER.debug("no session available, continue with timestamp only")
+
+
+async def _async_update_modified(self, lane: Lane):
+    """Fetch the sections of a lane from modified.xml, only the changes since its last poll once synced."""
+    state = self.state
+    cursor = lane.cursor
+    # a refresh of requested sections keeps the filter, a narrower one would resync on the next poll
+    cursor.use_filter(modified_filter(lane.sections.intersection(self.fetch_plan)))
+
+    for _ in range(2):
+        if not cursor.synced:
+            await _async_update_session(self, cursor)
 
-        return combined_data
+        update = ModifiedUpdate(full=not cursor.synced)
+        parser = StreamParser(update)
+        start = time.perf_counter()
 
+        success = await self.client.stream_xml_data("/xml/modified.xml",
+                                                    parser,
+                                                    cursor.params(),
+                                                    timeout=ENDPOINT_TIMEOUTS["/xml/modified.xml"],
+                                                    executor_threshold=self.executor_thresholds[lane.name])
 
-async def _async_update_modified(self):
-    """Fetch XML data asynchronously."""
-    return await get_xml_data(self.hass,
-                              self.config_entry.data.get(CONF_URL),
-                              self.config_entry.data.get(CONF_PORT),
-                              self.config_entry.data.get(CONF_PASSWORD),
-                              self.config_entry.data.get(CONF_TLS),
-                              "/xml/modified.xml")
+        self._account_request(lane, "/xml/modified.xml", parser, success, time.perf_counter() - start)
 
+        if not success:
+            cursor.invalidate()
+            return False
 
-async def _async_update_share(self):
+        if self._run_on_loop(state.apply_modified, update, cursor):
+            return True
+
+        cursor.invalidate()
+
+        if update.full:
+            _LOGGER.debug("/xml/modified.xml without timestamp, skip update")
+            return False
+
+        _LOGGER.debug("session of lane %s invalidated, full resync", lane.name)
+
+    return False
+
+
+async def _async_update_share(self, lane: Lane):
     """Fetch XML share data asynchronously."""
-    return await get_xml_data(self.hass,
-                              self.config_entry.data.get(CONF_URL),
-                              self.config_entry.data.get(CONF_PORT),
-                              self.config_entry.data.get(CONF_PASSWORD),
-                              self.config_entry.data.get(CONF_TLS),
-                              "/xml/share.xml")
+    update = ShareUpdate()
+    parser = StreamParser(update)
+    cache = self.response_caches["/xml/share.xml"]
+    start = time.perf_counter()
+
+    success = await self.client.stream_xml_data("/xml/share.xml",
+                                                parser,
+                                                cache=cache,
+                                                timeout=ENDPOINT_TIMEOUTS["/xml/share.xml"],
+                                                executor_threshold=self.executor_thresholds[lane.name])
+
+    self._account_request(lane, "/xml/share.xml", parser, success, time.perf_counter() - start)
+
+    if not success:
+        return False
+
+    if cache.changed:
+        if not update.complete:
+            _LOGGER.debug("/xml/share.xml incomplete, keep %d shares", len(self.state.shares))
+            return False
+        if parser.offloaded:
+            # a payload too large for the loop also gets its index built in the executor
+            await self.hass.async_add_executor_job(update.build, self.state.shares)
+        self._run_on_loop(self.state.apply_share, update)
+    else:
+        _LOGGER.debug("/xml/share.xml unchanged, keep %d shares", len(self.state.shares))
+
+    # only an applied share list is the base of the next conditional request
+    cache.commit()
+    return True
@@ -8,52 +8,263 @@ import aiohttp
 import defusedxml.ElementTree as ET
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+from homeassistant.util import ssl as ssl_util
+from yarl import URL
 
-from .const import TIMEOUT
+from .const import (
+    CONF_URL,
+    CONF_PORT,
+    CONF_PASSWORD,
+    CONF_TLS,
+    TIMEOUT,
+    CHUNK_SIZE,
+    EXECUTOR_BATCH_SIZE,
+    CLIENT_LIMIT_PER_HOST,
+    CLIENT_KEEPALIVE,
+    PROBE_TIMEOUT,
+)
+from .parser import StreamParser
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def call_function(hass: HomeAssistant, url: str, port: int, password: str, tls: bool, method: str):
-    """Call a function asynchronously using aiohttp."""
+class ResponseCache:
+    """Validators and body digest of the last applied response of one endpoint.
 
-    session = aiohttp_client.async_get_clientsession(hass)
-    protocol = "https" if tls else "http"
-    hashed_password = hashlib.md5(password.encode()).hexdigest()
-    full_url = f"{protocol}://{url}:{port}/function/{method}?password={hashed_password}"
+    A response only becomes the one later requests are validated against
+    once its payload was applied and commit() is called, so a payload that
+    got lost, e.g. by a cancelled poll, is fetched and applied again.
+    """
 
-    try:
-        async with asyncio.timeout(TIMEOUT):
-            async with session.get(full_url) as response:
-                response.raise_for_status()
-                return True
-    except aiohttp.ClientError as e:
-        _LOGGER.error("Error while calling function: %s", e)
+    def __init__(self):
+        """Init."""
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.changed = True
+        self.hits = 0
+        self.misses = 0
+        self._pending = None
 
-    return False
+    def request_headers(self) -> dict:
+        """Return the conditional request headers, if the core sent validators."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
 
+    def update(self, response, digest: str | None) -> None:
+        """Count hit or miss and keep the validators and digest of the response until commit()."""
+        self.changed = digest is not None and digest != self.digest
+        if self.changed:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._pending = (response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                         digest if self.changed else self.digest)
 
-async def get_xml_data(hass: HomeAssistant, url: str, port: int, password: str, tls: bool, endpoint: str):
-    """Fetch XML data asynchronously using aiohttp."""
+    def commit(self) -> None:
+        """Validate later requests against the last response, after its payload was applied."""
+        if self._pending is not None:
+            self.etag, self.last_modified, self.digest = self._pending
+            self._pending = None
 
-    session = aiohttp_client.async_get_clientsession(hass)
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
 
-    try:
-        protocol = "https" if tls else "http"
-        hashed_password = hashlib.md5(password.encode()).hexdigest()
-        full_url = f"{protocol}://{url}:{port}{endpoint}?password={hashed_password}"
 
-        _LOGGER.debug("call url: %s", full_url)
+class AppleJuiceClient:
+    """HTTP client of one appleJuice Core, shared by everything of a config entry.
 
-        async with asyncio.timeout(TIMEOUT):
-            async with session.get(full_url) as response:
-                response.raise_for_status()
-                xml_text = await response.text()
+    The password is hashed and the endpoint URLs are built once. Requests go
+    through a dedicated session whose connector keeps connections alive,
+    limits the connections to the core and reuses one SSL context, so TLS
+    sessions are resumed. Responses are requested compressed.
+    """
 
-                return ET.fromstring(xml_text)
+    def __init__(self, hass: HomeAssistant, url: str, port: int, password: str, tls: bool):
+        """Init."""
+        self.hass = hass
+        self.tls = tls
+        self.base_url = f"{'https' if tls else 'http'}://{url}:{port}"
+        self._password = hashlib.md5(password.encode()).hexdigest()
+        self._urls = {}
+        self._session = None
+        self._closed = False
 
-    except aiohttp.ClientError as e:
-        _LOGGER.error("Error while fetching XML data: %s", e)
+    @classmethod
+    def from_config(cls, hass: HomeAssistant, config: dict):
+        """Create a client from config entry data."""
+        return cls(hass, config.get(CONF_URL), config.get(CONF_PORT), config.get(CONF_PASSWORD),
+                   config.get(CONF_TLS))
 
-    return None
+    def url(self, path: str) -> URL:
+        """Return the authenticated URL of an endpoint or function path."""
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = URL(f"{self.base_url}{path}").with_query(password=self._password)
+        return url
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session of the client, created on first use.
+
+        A closed client does not open a new session, its requests fail.
+        """
+        if self._closed:
+            raise aiohttp.ClientConnectionError(f"client of {self.base_url} is closed")
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CLIENT_LIMIT_PER_HOST,
+                keepalive_timeout=CLIENT_KEEPALIVE,
+                ssl=ssl_util.get_default_context() if self.tls else False,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={aiohttp.hdrs.ACCEPT_ENCODING: "gzip, deflate"},
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its connections, for good."""
+        self._closed = True
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def call_function(self, method: str, params: dict | None = None) -> bool:
+        """Call a function of the core."""
+        try:
+            async with asyncio.timeout(TIMEOUT):
+                async with self.session.get(self.url(f"/function/{method}"), params=params) as response:
+                    response.raise_for_status()
+                    return True
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Error while calling function: %s", e)
+        except TimeoutError:
+            _LOGGER.warning("Timeout after %ss while calling function %s", TIMEOUT, method)
+
+        return False
+
+    async def probe(self, timeout: float = PROBE_TIMEOUT) -> bool:
+        """Return True if the core answers, with a short timeout and without reading the body."""
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.session.get(self.url("/xml/information.xml")) as response:
+                    response.raise_for_status()
+                    return True
+        except aiohttp.ClientError as e:
+            _LOGGER.debug("Probe of %s failed: %s", self.base_url, e)
+        except TimeoutError:
+            _LOGGER.debug("Probe of %s timed out after %ss", self.base_url, timeout)
+
+        return False
+
+    async def get_xml_data(self, endpoint: str, params: dict | None = None):
+        """Fetch XML data asynchronously using aiohttp."""
+        try:
+            _LOGGER.debug("call url: %s%s %s", self.base_url, endpoint, params or "")
+
+            async with asyncio.timeout(TIMEOUT):
+                async with self.session.get(self.url(endpoint), params=params) as response:
+                    response.raise_for_status()
+                    xml_text = await response.text()
+
+                    return ET.fromstring(xml_text)
+
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Error while fetching XML data: %s", e)
+        except TimeoutError:
+            _LOGGER.warning("Timeout after %ss while fetching %s", TIMEOUT, endpoint)
+        except (ET.ParseError, ValueError) as e:
+            _LOGGER.error("Error while parsing XML data from %s: %s", endpoint, e)
+
+        return None
+
+    async def stream_xml_data(self, endpoint: str, parser: StreamParser, params: dict | None = None,
+                              cache: ResponseCache | None = None, timeout: float = TIMEOUT,
+                              executor_threshold: int | None = None) -> bool:
+        """Fetch XML data and feed it chunk by chunk into the parser, without keeping the body.
+
+        With a cache, the body is hashed while it is parsed and cache.changed
+        tells whether the parser got anything new. A 304 answer to the
+        validators of the last response skips the download and parsing.
+        The caller commits the cache once it applied the payload.
+
+        Once more than executor_threshold bytes arrived, the chunks are fed in
+        batches to an executor job, the next batch is read while the previous
+        one is parsed.
+        """
+        hass = self.hass
+
+        try:
+            _LOGGER.debug("stream url: %s%s %s", self.base_url, endpoint, params or "")
+
+            digest = hashlib.blake2b(digest_size=16) if cache is not None else None
+            headers = cache.request_headers() if cache is not None else None
+            received = 0
+            batch = []
+            batch_size = 0
+            feeding = None
+
+            async with asyncio.timeout(timeout):
+                async with self.session.get(self.url(endpoint), params=params, headers=headers) as response:
+                    if response.status == 304 and cache is not None:
+                        cache.update(response, None)
+                        return True
+
+                    response.raise_for_status()
+
+                    if executor_threshold is not None and (response.content_length or 0) > executor_threshold:
+                        parser.offload()
+
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        if digest is not None:
+                            digest.update(chunk)
+                        received += len(chunk)
+
+                        if not parser.offloaded:
+                            parser.feed(chunk)
+                            if executor_threshold is not None and received > executor_threshold:
+                                parser.offload()
+                            continue
+
+                        batch.append(chunk)
+                        batch_size += len(chunk)
+                        if batch_size >= EXECUTOR_BATCH_SIZE:
+                            if feeding is not None:
+                                await feeding
+                            feeding = hass.async_add_executor_job(parser.feed, b"".join(batch))
+                            batch = []
+                            batch_size = 0
+
+                if feeding is not None:
+                    await feeding
+                if parser.offloaded:
+                    await hass.async_add_executor_job(parser.feed, b"".join(batch))
+                    await hass.async_add_executor_job(parser.close)
+                else:
+                    parser.close()
+
+            if cache is not None:
+                cache.update(response, digest.hexdigest())
+
+            return True
+
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Error while fetching XML data: %s", e)
+        except TimeoutError:
+            _LOGGER.warning("Timeout after %ss while fetching %s", timeout, endpoint)
+        except (ET.ParseError, ValueError) as e:
+            _LOGGER.error("Error while parsing XML data from %s: %s", endpoint, e)
+
+        return False
@@ -43,7 +43,7 @@ BINARY_SENSORS: tuple[AppleJuiceCoreBinarySensorDescription, ...] = [
         icon="mdi:security",
         device_class=BinarySensorDeviceClass.PROBLEM,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda sensor: sensor.coordinator.data.find("networkinfo").attrib.get("firewalled", "false") == "true",
+        value_fn=lambda sensor: sensor.coordinator.data.networkinfo.firewalled,
 
     ),
     AppleJuiceCoreBinarySensorDescription(
@@ -54,7 +54,7 @@ BINARY_SENSORS: tuple[AppleJuiceCoreBinarySensorDescription, ...] = [
         icon="mdi:pause-circle",
         device_class=BinarySensorDeviceClass.PROBLEM,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda sensor: sensor.coordinator.data.find("networkinfo").attrib.get("paused", "true") == "true",
+        value_fn=lambda sensor: sensor.coordinator.data.networkinfo.paused,
 
     )
 ]
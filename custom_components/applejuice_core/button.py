@@ -3,7 +3,6 @@ from homeassistant.components.button import ButtonEntity, ButtonEntityDescriptio
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN
-from .api import call_function
 from .entity import BaseAppleJuiceCoreEntity
 
 
@@ -36,14 +35,7 @@ class AppleJuiceCoreButton(BaseAppleJuiceCoreEntity, ButtonEntity):
         self._attr_entity_category = description.entity_category
 
     async def async_press(self):
-        await call_function(
-            self.coordinator.hass,
-            self.config_entry.data.get("url"),
-            self.config_entry.data.get("port"),
-            self.config_entry.data.get("password"),
-            self.config_entry.data.get("tls"),
-            self.entity_description.method
-        )
+        await self.coordinator.client.call_function(self.entity_description.method)
 
 
 BUTTONS: tuple[AppleJuiceCoreButtonDescription, ...] = (
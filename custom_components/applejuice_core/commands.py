@@ -0,0 +1,129 @@
+"""Coalesced download commands of one appleJuice Core."""
+
+import asyncio
+import logging
+
+from .const import COMMAND_CONCURRENCY, COMMAND_COALESCE
+
+_LOGGER = logging.getLogger(__name__)
+
+# commands of one group overwrite each other, the last one for a download wins
+COMMAND_GROUPS = {
+    "pausedownload": "status",
+    "resumedownload": "status",
+    "canceldownload": "status",
+    "setpowerdownload": "powerdownload",
+}
+
+# sections of the snapshot changed by the commands
+COMMAND_SECTIONS = frozenset({"download"})
+
+
+class DownloadCommands:
+    """Sends download commands to the core, coalesced and with bounded concurrency.
+
+    Commands are collected for COMMAND_COALESCE seconds. A command replaces
+    an unsent command of the same group for the same download, and a
+    command identical to one in flight waits for that one instead of being
+    sent again. Each batch is sent with at most COMMAND_CONCURRENCY requests
+    at once and followed by one debounced refresh of the download section.
+    """
+
+    def __init__(self, coordinator):
+        """Init."""
+        self.coordinator = coordinator
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._queued = {}
+        self._in_flight = {}
+        self._slots = asyncio.Semaphore(COMMAND_CONCURRENCY)
+        self._timer = None
+        self._batches = set()
+
+    async def async_send(self, method: str, download_ids, params: dict | None = None) -> list:
+        """Send a command for every download, return the ids it failed for."""
+        download_ids = list(dict.fromkeys(str(download_id) for download_id in download_ids))
+        futures = [self._queue(method, download_id, params or {}) for download_id in download_ids]
+        results = await asyncio.gather(*futures)
+        return [download_id for download_id, success in zip(download_ids, results) if not success]
+
+    def _queue(self, method: str, download_id: str, params: dict) -> asyncio.Future:
+        """Queue one command, return the future of its result."""
+        command = (method, download_id, tuple(sorted(params.items())))
+
+        in_flight = self._in_flight.get(command)
+        if in_flight is not None:
+            self.coalesced += 1
+            return asyncio.shield(in_flight)
+
+        key = (COMMAND_GROUPS[method], download_id)
+        queued = self._queued.get(key)
+        if queued is not None:
+            self.coalesced += 1
+            self._queued[key] = (command, queued[1])
+            return asyncio.shield(queued[1])
+
+        future = self.coordinator.hass.loop.create_future()
+        self._queued[key] = (command, future)
+        if self._timer is None:
+            self._timer = self.coordinator.hass.loop.call_later(COMMAND_COALESCE, self._flush)
+        return asyncio.shield(future)
+
+    def _flush(self) -> None:
+        """Send the queued commands."""
+        self._timer = None
+        queued, self._queued = self._queued, {}
+        batch = self.coordinator.hass.async_create_task(self._async_send_batch(list(queued.values())))
+        self._batches.add(batch)
+        batch.add_done_callback(self._batches.discard)
+
+    async def _async_send_batch(self, batch) -> None:
+        """Send a batch of commands, then refresh what they changed."""
+        for command, future in batch:
+            self._in_flight[command] = future
+
+        await asyncio.gather(*(self._async_send_command(command, future) for command, future in batch))
+
+        _LOGGER.debug("%s: sent %d download commands", self.coordinator.name, len(batch))
+        await self.coordinator.async_request_sections(COMMAND_SECTIONS)
+
+    async def _async_send_command(self, command, future) -> None:
+        """Send one command within a concurrency slot."""
+        method, download_id, params = command
+        try:
+            async with self._slots:
+                success = await self.coordinator.client.call_function(method, {"id": download_id, **dict(params)})
+        finally:
+            self._in_flight.pop(command, None)
+
+        self.sent += 1
+        if not success:
+            self.failed += 1
+        if not future.done():
+            future.set_result(success)
+
+    def cancel(self) -> None:
+        """Drop the unsent commands and cancel the batches being sent, with their refresh."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, future in self._queued.values():
+            if not future.done():
+                future.cancel()
+        self._queued = {}
+        for batch in self._batches:
+            batch.cancel()
+        for future in self._in_flight.values():
+            if not future.done():
+                future.cancel()
+
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "queued": len(self._queued),
+            "in_flight": len(self._in_flight),
+        }
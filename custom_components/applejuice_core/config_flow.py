@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from logging import Logger
+from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
@@ -9,7 +10,8 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.util import network, slugify
 
-from .api import get_xml_data
+from .api import AppleJuiceClient
+from .deadband import write_limit_option
 
 from .const import (
     CONF_URL,
@@ -17,6 +19,26 @@ from .const import (
     CONF_PASSWORD,
     CONF_TLS,
     CONF_OPTION_POLLING_RATE,
+    CONF_OPTION_POLLING_RATE_MIN,
+    CONF_OPTION_POLLING_RATE_MAX,
+    CONF_OPTION_POLLING_RATE_FAST,
+    CONF_OPTION_POLLING_RATE_SLOW,
+    DEFAULT_POLLING_RATE,
+    DEFAULT_POLLING_RATE_MIN,
+    DEFAULT_POLLING_RATE_MAX,
+    DEFAULT_POLLING_RATE_FAST,
+    DEFAULT_POLLING_RATE_SLOW,
+    CONF_OPTION_DOWNLOAD_ENTITIES,
+    CONF_OPTION_DOWNLOAD_ENTITIES_LIMIT,
+    CONF_OPTION_DOWNLOAD_ENTITIES_FILTER,
+    DEFAULT_DOWNLOAD_ENTITIES_LIMIT,
+    CONF_OPTION_EXECUTOR_THRESHOLD,
+    DEFAULT_EXECUTOR_THRESHOLD,
+    WRITE_LIMIT_SENSORS,
+    WRITE_LIMIT_DEADBAND,
+    WRITE_LIMIT_DEADBAND_RELATIVE,
+    WRITE_LIMIT_INTERVAL_MIN,
+    WRITE_LIMIT_INTERVAL_MAX,
     DOMAIN,
 )
 
@@ -94,7 +116,11 @@ class AppleJuiceConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def _test_connection(self, host, port, password, tls):
         """Validate the connection by requesting /xml/information.xml."""
 
-        xml_data = await get_xml_data(self.hass, host, port, password, tls, "/xml/information.xml")
+        client = AppleJuiceClient(self.hass, host, port, password, tls)
+        try:
+            xml_data = await client.get_xml_data("/xml/information.xml")
+        finally:
+            await client.close()
 
         if xml_data is None:
             return False
@@ -117,13 +143,15 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._options = {}
 
     async def async_step_init(
             self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            self._options = user_input
+            return await self.async_step_write_limits()
 
         return self.async_show_form(
             step_id="init",
@@ -132,9 +160,77 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(
                         CONF_OPTION_POLLING_RATE,
                         default=self.config_entry.options.get(
-                            CONF_OPTION_POLLING_RATE, 30
+                            CONF_OPTION_POLLING_RATE, DEFAULT_POLLING_RATE
                         ),
-                    ): int,
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_OPTION_POLLING_RATE_MIN,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_POLLING_RATE_MIN, DEFAULT_POLLING_RATE_MIN
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_OPTION_POLLING_RATE_MAX,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_POLLING_RATE_MAX, DEFAULT_POLLING_RATE_MAX
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_OPTION_POLLING_RATE_FAST,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_POLLING_RATE_FAST, DEFAULT_POLLING_RATE_FAST
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_OPTION_POLLING_RATE_SLOW,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_POLLING_RATE_SLOW, DEFAULT_POLLING_RATE_SLOW
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_OPTION_DOWNLOAD_ENTITIES,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_DOWNLOAD_ENTITIES, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_OPTION_DOWNLOAD_ENTITIES_LIMIT,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_DOWNLOAD_ENTITIES_LIMIT, DEFAULT_DOWNLOAD_ENTITIES_LIMIT
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_OPTION_DOWNLOAD_ENTITIES_FILTER,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_DOWNLOAD_ENTITIES_FILTER, "*"
+                        ),
+                    ): str,
+                    vol.Optional(
+                        CONF_OPTION_EXECUTOR_THRESHOLD,
+                        default=self.config_entry.options.get(
+                            CONF_OPTION_EXECUTOR_THRESHOLD, DEFAULT_EXECUTOR_THRESHOLD
+                        ),
+                    ): vol.All(int, vol.Range(min=0)),
                 }
             ),
         )
+
+    async def async_step_write_limits(
+            self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the deadband and write intervals of each high-churn sensor, 0 disables a limit."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**self._options, **user_input})
+
+        schema = {}
+        for sensor_key in WRITE_LIMIT_SENSORS:
+            for setting, validator in (
+                    (WRITE_LIMIT_DEADBAND, vol.All(vol.Coerce(float), vol.Range(min=0))),
+                    (WRITE_LIMIT_DEADBAND_RELATIVE, vol.All(vol.Coerce(float), vol.Range(min=0, max=100))),
+                    (WRITE_LIMIT_INTERVAL_MIN, vol.All(int, vol.Range(min=0))),
+                    (WRITE_LIMIT_INTERVAL_MAX, vol.All(int, vol.Range(min=0))),
+            ):
+                option = write_limit_option(sensor_key, setting)
+                schema[vol.Optional(option, default=self.config_entry.options.get(option, 0))] = validator
+
+        return self.async_show_form(step_id="write_limits", data_schema=vol.Schema(schema))
@@ -8,10 +8,124 @@ PLATFORMS = [
     Platform.BUTTON,
 ]
 
+# key of the shared FleetScheduler in hass.data[DOMAIN], next to the coordinators by entry id
+DATA_FLEET = "fleet"
+
 CONF_URL = "url"
 CONF_PORT = "port"
 CONF_PASSWORD = "password"
 CONF_TLS = "tls"
 CONF_OPTION_POLLING_RATE = "polling_rate"
+CONF_OPTION_POLLING_RATE_MIN = "polling_rate_min"
+CONF_OPTION_POLLING_RATE_MAX = "polling_rate_max"
+CONF_OPTION_POLLING_RATE_FAST = "polling_rate_fast"
+CONF_OPTION_POLLING_RATE_SLOW = "polling_rate_slow"
+CONF_OPTION_DOWNLOAD_ENTITIES = "download_entities"
+CONF_OPTION_DOWNLOAD_ENTITIES_LIMIT = "download_entities_limit"
+CONF_OPTION_DOWNLOAD_ENTITIES_FILTER = "download_entities_filter"
+CONF_OPTION_EXECUTOR_THRESHOLD = "executor_threshold"
+
+DEFAULT_POLLING_RATE = 30
+DEFAULT_POLLING_RATE_MIN = 10
+DEFAULT_POLLING_RATE_MAX = 300
+DEFAULT_POLLING_RATE_FAST = 5
+DEFAULT_POLLING_RATE_SLOW = 300
+DEFAULT_DOWNLOAD_ENTITIES_LIMIT = 50
+DEFAULT_EXECUTOR_THRESHOLD = 256
+
+# idle cores back off by this factor per poll, every interval is varied by +/- POLLING_JITTER
+BACKOFF_FACTOR = 2
+POLLING_JITTER = 0.1
+
+# the live lane backs off to at most this multiple of the fast rate, so new activity shows up soon
+LIVE_BACKOFF_MAX = 2
+
+# lanes due within this many seconds of a poll are polled with it, and the shortest wait between polls
+LANE_SLACK = 1.0
 
 TIMEOUT = 10
+
+# deadline per streamed endpoint and overall budget of one poll, the endpoints are fetched concurrently;
+# the budget exceeds every deadline, so a slow endpoint fails by its own timeout and is marked stale
+ENDPOINT_TIMEOUTS = {
+    "/xml/modified.xml": 10,
+    "/xml/share.xml": 15,
+}
+POLL_TIMEOUT = max(ENDPOINT_TIMEOUTS.values()) + 5
+
+# failed polls in a row that open the circuit breaker, first and longest seconds it stays open,
+# and the timeout of the probe request sent once it is half-open
+BREAKER_THRESHOLD = 2
+BREAKER_BACKOFF = 10
+BREAKER_BACKOFF_MAX = 300
+PROBE_TIMEOUT = 3
+
+# polls of all cores running at once and the most seconds between two poll starts, less once
+# the shortest poll interval of a core divided by the number of cores is shorter
+FLEET_MAX_POLLS = 4
+FLEET_STAGGER = 0.25
+
+# bytes per chunk fed into the streaming XML parser, and per batch once parsing runs in an executor
+CHUNK_SIZE = 64 * 1024
+EXECUTOR_BATCH_SIZE = 1024 * 1024
+
+# connections per core, one per polling lane plus COMMAND_CONCURRENCY, so no request waits for a
+# connection within its deadline, and seconds an idle connection is kept open
+CLIENT_LIMIT_PER_HOST = 6
+CLIENT_KEEPALIVE = 60
+
+# download commands sent to one core at once, at most CLIENT_LIMIT_PER_HOST, seconds to wait for
+# more commands to coalesce, and the cooldown of the refresh of the sections they changed
+COMMAND_CONCURRENCY = 2
+COMMAND_COALESCE = 0.25
+COMMAND_REFRESH_COOLDOWN = 1.0
+
+# samples kept for the rolling telemetry percentiles
+TELEMETRY_WINDOW = 100
+
+# samples of the throughput series, one per poll of the live speeds
+THROUGHPUT_WINDOW = 120
+
+# version of the stored snapshot and seconds between two writes of it at most
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# high-churn sensors whose writes can be limited, each with its own options "<sensor>_<setting>":
+# absolute deadband in the unit of the sensor, relative deadband in percent, minimum and maximum
+# seconds between two writes; 0 disables a setting, all 0 (the default) writes every change
+WRITE_LIMIT_SENSORS = ("uploadspeed", "downloadspeed", "openconnections", "sessionupload", "sessiondownload")
+WRITE_LIMIT_DEADBAND = "deadband"
+WRITE_LIMIT_DEADBAND_RELATIVE = "deadband_relative"
+WRITE_LIMIT_INTERVAL_MIN = "write_interval_min"
+WRITE_LIMIT_INTERVAL_MAX = "write_interval_max"
+WRITE_LIMIT_SETTINGS = (
+    WRITE_LIMIT_DEADBAND,
+    WRITE_LIMIT_DEADBAND_RELATIVE,
+    WRITE_LIMIT_INTERVAL_MIN,
+    WRITE_LIMIT_INTERVAL_MAX,
+)
+
+# seconds an endpoint may keep the event loop busy, beyond that its payloads go to the executor earlier
+LOOP_BUSY_LIMIT = 0.05
+
+DOWNLOAD_STATUS_ACTIVE = 0
+DOWNLOAD_STATUS_NOT_ENOUGH_SPACE = 1
+DOWNLOAD_STATUS_FINISHING = 12
+DOWNLOAD_STATUS_FINISHING_ERROR = 13
+DOWNLOAD_STATUS_READY = 14
+DOWNLOAD_STATUS_CANCELLING = 15
+DOWNLOAD_STATUS_CREATING = 16
+DOWNLOAD_STATUS_CANCELLED = 17
+DOWNLOAD_STATUS_PAUSED = 18
+
+DOWNLOAD_STATUS_NAMES = {
+    DOWNLOAD_STATUS_ACTIVE: "active",
+    DOWNLOAD_STATUS_NOT_ENOUGH_SPACE: "not_enough_space",
+    DOWNLOAD_STATUS_FINISHING: "finishing",
+    DOWNLOAD_STATUS_FINISHING_ERROR: "finishing_error",
+    DOWNLOAD_STATUS_READY: "ready",
+    DOWNLOAD_STATUS_CANCELLING: "cancelling",
+    DOWNLOAD_STATUS_CREATING: "creating",
+    DOWNLOAD_STATUS_CANCELLED: "cancelled",
+    DOWNLOAD_STATUS_PAUSED: "paused",
+}
@@ -0,0 +1,76 @@
+"""Deadband and write interval limits of high-churn sensors."""
+
+import logging
+
+from .const import (
+    WRITE_LIMIT_DEADBAND,
+    WRITE_LIMIT_DEADBAND_RELATIVE,
+    WRITE_LIMIT_INTERVAL_MIN,
+    WRITE_LIMIT_INTERVAL_MAX,
+    WRITE_LIMIT_SETTINGS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def write_limit_option(sensor_key: str, setting: str) -> str:
+    """Return the option key of a write limit setting of a sensor."""
+    return f"{sensor_key}_{setting}"
+
+
+class WriteFilter:
+    """Decides when a new value of a sensor is written to the state machine, and so to the recorder.
+
+    A value is written once it differs from the last written one by at
+    least the deadband, the larger of the absolute deadband and the relative
+    deadband times the written value, but not before interval_min seconds
+    passed. A value within the deadband is still written after interval_max
+    seconds, so small drifts are not hidden forever. 0 disables an interval.
+    """
+
+    def __init__(self, absolute: float = 0.0, relative: float = 0.0, interval_min: float = 0.0,
+                 interval_max: float = 0.0):
+        """Init."""
+        self.absolute = absolute
+        self.relative = relative
+        self.interval_min = interval_min
+        self.interval_max = interval_max
+        self.value = None
+        self.written_at = None
+        self.suppressed = 0
+
+    @classmethod
+    def from_options(cls, sensor_key: str, options) -> "WriteFilter | None":
+        """Return the write filter of a sensor, None if none of its write limits is set."""
+        settings = {setting: options.get(write_limit_option(sensor_key, setting)) or 0
+                    for setting in WRITE_LIMIT_SETTINGS}
+        if not any(settings.values()):
+            return None
+        return cls(
+            settings[WRITE_LIMIT_DEADBAND],
+            settings[WRITE_LIMIT_DEADBAND_RELATIVE] / 100,
+            settings[WRITE_LIMIT_INTERVAL_MIN],
+            settings[WRITE_LIMIT_INTERVAL_MAX],
+        )
+
+    def delay(self, value, now: float) -> float | None:
+        """Return 0 if the value is written now, the seconds until it may be written, or None if it is not."""
+        if self.written_at is None or value is None or self.value is None:
+            return 0.0 if value != self.value or self.written_at is None else None
+        if value == self.value:
+            return None
+
+        elapsed = now - self.written_at
+        try:
+            within = abs(value - self.value) < max(self.absolute, self.relative * abs(self.value))
+        except TypeError:
+            within = False
+
+        if within:
+            return max(self.interval_max - elapsed, 0.0) if self.interval_max else None
+        return max(self.interval_min - elapsed, 0.0)
+
+    def written(self, value, now: float) -> None:
+        """Remember the written value."""
+        self.value = value
+        self.written_at = now
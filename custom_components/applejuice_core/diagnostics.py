@@ -0,0 +1,40 @@
+"""Diagnostics support for appleJuice Core."""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "version": coordinator.version,
+        "system": coordinator.system,
+        "stale": sorted(coordinator.state.stale),
+        "restored": coordinator.restored,
+        "restored_aggregates": sorted(coordinator.state.restored),
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "lanes": {lane.name: lane.as_dict(hass.loop.time()) for lane in coordinator.lanes},
+        "breaker": coordinator.breaker.as_dict(hass.loop.time()),
+        "event_loop": {
+            "busy": round(coordinator.loop_busy, 4),
+            "busy_max": round(coordinator.loop_busy_max, 4),
+            "offloaded": coordinator.offloaded,
+            "executor_thresholds": coordinator.executor_thresholds,
+        },
+        "listeners": {
+            "skipped_writes": coordinator.skipped_writes,
+            "skipped_writes_total": coordinator.skipped_writes_total,
+            "suppressed_writes": dict(coordinator.suppressed_writes),
+        },
+        "commands": coordinator.commands.as_dict(),
+        "telemetry": coordinator.telemetry.as_dict(),
+        "throughput": coordinator.throughput.as_dict(),
+        "fleet": coordinator.fleet.as_dict(),
+        "response_cache": {
+            endpoint: cache.as_dict() for endpoint, cache in coordinator.response_caches.items()
+        },
+    }
@@ -10,7 +10,35 @@ from .const import DOMAIN
 _LOGGER = logging.getLogger(__name__)
 
 
-class BaseAppleJuiceCoreEntity(CoordinatorEntity):
+def normalize_subscriptions(subscriptions) -> frozenset:
+    """Return the subscriptions as set of (section,) or (section, attribute) tuples."""
+    return frozenset(
+        (subscription,) if isinstance(subscription, str) else tuple(subscription)
+        for subscription in subscriptions or ()
+    )
+
+
+class BaseAppleJuiceEntity(CoordinatorEntity):
+    """Base class entity registering its subscriptions with the coordinator."""
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the sections this entity reads.
+
+        The subscriptions are also the listener context, so the coordinator
+        only calls entities whose inputs changed.
+        """
+        subscriptions = normalize_subscriptions(getattr(self.entity_description, "subscriptions", None))
+        self.coordinator_context = self._listener_context(subscriptions) or None
+        await super().async_added_to_hass()
+        if subscriptions:
+            self.async_on_remove(self.coordinator.async_subscribe(subscriptions))
+
+    def _listener_context(self, subscriptions: frozenset) -> frozenset:
+        """Return the changes this entity is updated for, its subscriptions by default."""
+        return subscriptions
+
+
+class BaseAppleJuiceCoreEntity(BaseAppleJuiceEntity):
     """Base class entity for appleJuice Core."""
 
     def __init__(self, coordinator, config_entry):
@@ -35,7 +63,7 @@ class BaseAppleJuiceCoreEntity(CoordinatorEntity):
         )
 
 
-class BaseAppleJuiceNetworkEntity(CoordinatorEntity):
+class BaseAppleJuiceNetworkEntity(BaseAppleJuiceEntity):
     """Base class entity for appleJuice Network."""
 
     def __init__(self, coordinator, config_entry):
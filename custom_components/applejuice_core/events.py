@@ -0,0 +1,110 @@
+"""Home Assistant events of download and connection transitions."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    DOWNLOAD_STATUS_ACTIVE,
+    DOWNLOAD_STATUS_READY,
+    DOWNLOAD_STATUS_CANCELLING,
+    DOWNLOAD_STATUS_CANCELLED,
+    DOWNLOAD_STATUS_PAUSED,
+    DOWNLOAD_STATUS_NAMES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_DOWNLOAD_FINISHED = f"{DOMAIN}_download_finished"
+EVENT_DOWNLOAD_PAUSED = f"{DOMAIN}_download_paused"
+EVENT_DOWNLOAD_RESUMED = f"{DOMAIN}_download_resumed"
+EVENT_DOWNLOAD_CANCELLED = f"{DOMAIN}_download_cancelled"
+EVENT_DOWNLOAD_REMOVED = f"{DOMAIN}_download_removed"
+EVENT_SERVER_SWITCHED = f"{DOMAIN}_server_switched"
+EVENT_FIREWALLED_CHANGED = f"{DOMAIN}_firewalled_changed"
+
+# section each event is derived from
+EVENT_SECTIONS = {
+    EVENT_DOWNLOAD_FINISHED: "download",
+    EVENT_DOWNLOAD_PAUSED: "download",
+    EVENT_DOWNLOAD_RESUMED: "download",
+    EVENT_DOWNLOAD_CANCELLED: "download",
+    EVENT_DOWNLOAD_REMOVED: "download",
+    EVENT_SERVER_SWITCHED: "networkinfo",
+    EVENT_FIREWALLED_CHANGED: "networkinfo",
+}
+
+
+@callback
+def event_sections(hass: HomeAssistant) -> frozenset:
+    """Return the sections needed by the events something listens to, e.g. an automation."""
+    listeners = hass.bus.async_listeners()
+    return frozenset(section for event_type, section in EVENT_SECTIONS.items() if listeners.get(event_type))
+
+
+def _download_data(download) -> dict:
+    """Return the event data of a download."""
+    return {
+        "download_id": download.id,
+        "filename": download.filename,
+        "size": download.size,
+        "status": DOWNLOAD_STATUS_NAMES.get(download.status, "unknown"),
+    }
+
+
+def download_events(previous, current, download_ids=None):
+    """Yield (event type, data) for the transitions of the downloads.
+
+    Only the given download ids are compared, so a delta costs O(changes).
+    None compares every download, after a full resync.
+    """
+    if download_ids is None:
+        download_ids = previous.downloads.keys() | current.downloads.keys()
+
+    for download_id in download_ids:
+        old = previous.downloads.get(download_id)
+        if old is None:
+            continue
+        new = current.downloads.get(download_id)
+        if new is None:
+            yield EVENT_DOWNLOAD_REMOVED, _download_data(old)
+        elif new.status == old.status:
+            continue
+        elif new.status == DOWNLOAD_STATUS_READY:
+            yield EVENT_DOWNLOAD_FINISHED, _download_data(new)
+        elif new.status == DOWNLOAD_STATUS_PAUSED:
+            yield EVENT_DOWNLOAD_PAUSED, _download_data(new)
+        elif new.status in (DOWNLOAD_STATUS_CANCELLING, DOWNLOAD_STATUS_CANCELLED):
+            if old.status not in (DOWNLOAD_STATUS_CANCELLING, DOWNLOAD_STATUS_CANCELLED):
+                yield EVENT_DOWNLOAD_CANCELLED, _download_data(new)
+        elif new.status == DOWNLOAD_STATUS_ACTIVE and old.status == DOWNLOAD_STATUS_PAUSED:
+            yield EVENT_DOWNLOAD_RESUMED, _download_data(new)
+
+
+def _server_data(snapshot, server_id: str) -> dict | None:
+    """Return the event data of a server, None if not connected."""
+    if not server_id:
+        return None
+    server = snapshot.servers.get(server_id)
+    return {
+        "id": server_id,
+        "name": server.name if server is not None else None,
+        "host": server.host if server is not None else None,
+        "port": server.port if server is not None else None,
+    }
+
+
+def network_events(previous, current):
+    """Yield (event type, data) for a switch of the server and a change of the firewall state."""
+    old, new = previous.networkinfo, current.networkinfo
+    if old is new:
+        return
+
+    if new.connectedwithserverid != old.connectedwithserverid:
+        yield EVENT_SERVER_SWITCHED, {
+            "previous": _server_data(previous, old.connectedwithserverid),
+            "server": _server_data(current, new.connectedwithserverid),
+        }
+    if new.firewalled != old.firewalled:
+        yield EVENT_FIREWALLED_CHANGED, {"firewalled": new.firewalled}
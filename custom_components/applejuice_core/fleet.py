@@ -0,0 +1,129 @@
+"""Shared poll scheduler for all configured appleJuice Cores."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_FLEET, FLEET_MAX_POLLS, FLEET_STAGGER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CoreStats:
+    """Queueing statistics of one core."""
+
+    __slots__ = ("polls", "waited", "max_wait", "busy")
+
+    def __init__(self):
+        """Init."""
+        self.polls = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+        self.busy = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the statistics for diagnostics."""
+        return {
+            "polls": self.polls,
+            "avg_wait": round(self.waited / self.polls, 3) if self.polls else 0.0,
+            "max_wait": round(self.max_wait, 3),
+            "busy": round(self.busy, 3),
+        }
+
+
+class FleetScheduler:
+    """Limits how many cores poll at once and spaces their poll starts.
+
+    Cores wait in FIFO order for one of FLEET_MAX_POLLS slots, so no core
+    starves. Two poll starts are spaced by FLEET_STAGGER seconds, or by the
+    shortest poll interval of the cores divided by their number if that is
+    less, so every core still gets to poll within its interval.
+    """
+
+    def __init__(self, max_polls: int = FLEET_MAX_POLLS, stagger: float = FLEET_STAGGER):
+        """Init."""
+        self.max_polls = max_polls
+        self.stagger = stagger
+        self.queued = 0
+        self.max_queued = 0
+        self.stats = {}
+        self.intervals = {}
+        self._slots = asyncio.Semaphore(max_polls)
+        self._start_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def poll(self, core: str):
+        """Hold a poll slot for the core while the block runs."""
+        loop = asyncio.get_running_loop()
+        stats = self.stats.setdefault(core, CoreStats())
+        queued_at = loop.time()
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        try:
+            async with self._start_lock:
+                delay = self._next_start - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start = loop.time() + self.spacing
+
+            started_at = loop.time()
+            wait = started_at - queued_at
+            stats.polls += 1
+            stats.waited += wait
+            stats.max_wait = max(stats.max_wait, wait)
+
+            try:
+                yield
+            finally:
+                stats.busy += loop.time() - started_at
+        finally:
+            self._slots.release()
+
+    @property
+    def spacing(self) -> float:
+        """Return the seconds between two poll starts."""
+        if not self.intervals:
+            return self.stagger
+        return min(self.stagger, min(self.intervals.values()) / len(self.intervals))
+
+    def add(self, core: str, interval: float) -> None:
+        """Register a core with the shortest interval it polls at."""
+        self.intervals[core] = interval
+
+    def remove(self, core: str) -> None:
+        """Forget an unloaded core and its statistics."""
+        self.intervals.pop(core, None)
+        self.stats.pop(core, None)
+
+    def as_dict(self) -> dict:
+        """Return the fleet statistics for diagnostics."""
+        total = sum(stats.polls for stats in self.stats.values())
+        return {
+            "max_polls": self.max_polls,
+            "stagger": self.stagger,
+            "spacing": round(self.spacing, 3),
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "cores": {
+                core: {**stats.as_dict(), "poll_share": round(stats.polls / total, 3) if total else 0.0}
+                for core, stats in self.stats.items()
+            },
+        }
+
+
+def async_get_fleet(hass: HomeAssistant) -> FleetScheduler:
+    """Return the fleet scheduler of the integration, create it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_FLEET not in data:
+        data[DATA_FLEET] = FleetScheduler()
+    return data[DATA_FLEET]
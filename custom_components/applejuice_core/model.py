@@ -0,0 +1,671 @@
+"""Long-lived state model of an appleJuice Core."""
+
+import logging
+from types import MappingProxyType
+
+from .const import DOWNLOAD_STATUS_ACTIVE
+
+from .share_index import EMPTY_SHARE_INDEX, ShareIndex, ShareIndexBuilder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _int(value) -> int:
+    """Convert an XML attribute to int, 0 if missing or invalid."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value) -> float:
+    """Convert an XML attribute with decimal comma to float."""
+    try:
+        return float(value.replace(",", "."))
+    except (AttributeError, ValueError):
+        return 0.0
+
+
+def _bool(value) -> bool:
+    """Convert an XML "true"/"false" attribute to bool."""
+    return value == "true"
+
+
+def _bool_true(value) -> bool:
+    """Convert an XML "true"/"false" attribute to bool, True if missing."""
+    return value != "false"
+
+
+def _str(value) -> str:
+    """Keep an XML attribute as string, "" if missing."""
+    return value or ""
+
+
+class Record:
+    """Record built from the attributes of one XML element.
+
+    Subclasses list their attributes in FIELDS as (name, converter) pairs,
+    the values are converted once while parsing. Records are shared between
+    snapshots, treat them as read-only.
+    """
+
+    __slots__ = ()
+    FIELDS: tuple = ()
+
+    def __init__(self, *values):
+        """Init."""
+        for (name, _), value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_attrib(cls, attrib):
+        """Create the record from an XML attribute dict."""
+        return cls(*(convert(attrib.get(name)) for name, convert in cls.FIELDS))
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        """Create the record from stored values, fields missing there get their empty value."""
+        return cls(*(values[name] if name in values else convert(None) for name, convert in cls.FIELDS))
+
+    def as_dict(self) -> dict:
+        """Return the field values for storage."""
+        return {name: getattr(self, name) for name, _ in self.FIELDS}
+
+    def __eq__(self, other):
+        """Compare records field by field."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        """Hash the field values."""
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        """Return the record fields."""
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class InformationRecord(Record):
+    """<information> of modified.xml."""
+
+    FIELDS = (
+        ("credits", _int),
+        ("sessionupload", _int),
+        ("sessiondownload", _int),
+        ("uploadspeed", _int),
+        ("downloadspeed", _int),
+        ("openconnections", _int),
+        ("maxuploadpositions", _int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class NetworkInfoRecord(Record):
+    """<networkinfo> of modified.xml."""
+
+    FIELDS = (
+        ("users", _int),
+        ("files", _int),
+        ("filesize", _float),
+        ("firewalled", _bool),
+        ("paused", _bool_true),
+        ("ip", _str),
+        ("connectedwithserverid", _str),
+        ("connectedsince", _int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class DownloadRecord(Record):
+    """<download> of modified.xml."""
+
+    FIELDS = (
+        ("id", _str),
+        ("shareid", _str),
+        ("hash", _str),
+        ("filename", _str),
+        ("size", _int),
+        ("ready", _int),
+        ("status", _int),
+        ("powerdownload", _int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class UploadRecord(Record):
+    """<upload> of modified.xml."""
+
+    FIELDS = (
+        ("id", _str),
+        ("shareid", _str),
+        ("nick", _str),
+        ("status", _int),
+        ("priority", _int),
+        ("speed", _int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class UserRecord(Record):
+    """<user> of modified.xml, a source of a download."""
+
+    FIELDS = (
+        ("id", _str),
+        ("downloadid", _str),
+        ("nickname", _str),
+        ("status", _int),
+        ("speed", _int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class ServerRecord(Record):
+    """<server> of modified.xml."""
+
+    FIELDS = (
+        ("id", _str),
+        ("name", _str),
+        ("host", _str),
+        ("port", _int),
+        ("lastseen", _int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+# modified.xml objects that are keyed by their "id" attribute
+OBJECT_TAGS = {
+    "download": DownloadRecord,
+    "upload": UploadRecord,
+    "user": UserRecord,
+    "server": ServerRecord,
+}
+
+# snapshot sections served by each endpoint
+MODIFIED_SECTIONS = ("information", "networkinfo", *OBJECT_TAGS)
+SHARE_SECTIONS = ("shares",)
+ALL_SECTIONS = frozenset(MODIFIED_SECTIONS + SHARE_SECTIONS)
+
+# modified.xml filter that delivers each section
+MODIFIED_FILTERS = {
+    "information": "informations",
+    "networkinfo": "informations",
+    "download": "down",
+    "user": "user",
+    "upload": "uploads",
+    "server": "server",
+}
+
+ALL_FILTERS = frozenset(MODIFIED_FILTERS.values())
+
+
+def modified_filter(sections) -> frozenset:
+    """Return the modified.xml filters needed for the given sections."""
+    return frozenset(MODIFIED_FILTERS[section] for section in sections if section in MODIFIED_FILTERS)
+
+EMPTY_INFORMATION = InformationRecord.from_attrib({})
+# nothing loaded yet is not a paused core
+EMPTY_NETWORKINFO = NetworkInfoRecord.from_attrib({"paused": "false"})
+
+
+class Aggregate:
+    """Counts and byte totals of one collection, built in a single pass.
+
+    by_status and by_priority are histograms, so any per-status or
+    per-priority counter is a dict lookup.
+    """
+
+    __slots__ = ("count", "size", "ready", "speed", "by_status", "by_priority", "active_remaining")
+
+    def __init__(self, count=0, size=0, ready=0, speed=0, by_status=None, by_priority=None, active_remaining=0):
+        """Init."""
+        self.count = count
+        self.size = size
+        self.ready = ready
+        self.speed = speed
+        self.by_status = by_status or {}
+        self.by_priority = by_priority or {}
+        self.active_remaining = active_remaining
+
+    @classmethod
+    def of_downloads(cls, downloads):
+        """Aggregate the download records, active_remaining are the bytes the active ones still need."""
+        size = ready = active_remaining = 0
+        by_status = {}
+        by_priority = {}
+        for download in downloads:
+            size += download.size
+            ready += download.ready
+            if download.status == DOWNLOAD_STATUS_ACTIVE:
+                active_remaining += download.size - download.ready
+            by_status[download.status] = by_status.get(download.status, 0) + 1
+            by_priority[download.powerdownload] = by_priority.get(download.powerdownload, 0) + 1
+        return cls(len(downloads), size, ready, 0, by_status, by_priority, active_remaining)
+
+    @classmethod
+    def of_uploads(cls, uploads):
+        """Aggregate the upload records."""
+        speed = 0
+        by_status = {}
+        by_priority = {}
+        for upload in uploads:
+            speed += upload.speed
+            by_status[upload.status] = by_status.get(upload.status, 0) + 1
+            by_priority[upload.priority] = by_priority.get(upload.priority, 0) + 1
+        return cls(len(uploads), 0, 0, speed, by_status, by_priority)
+
+    @classmethod
+    def of_shares(cls, shares):
+        """Aggregate the share index."""
+        return cls(len(shares), shares.total_size, 0, 0, None, shares.by_priority())
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        """Create the aggregate from stored values, JSON turned the histogram keys into strings."""
+        return cls(
+            values.get("count", 0),
+            values.get("size", 0),
+            values.get("ready", 0),
+            values.get("speed", 0),
+            {int(key): count for key, count in values.get("by_status", {}).items()},
+            {int(key): count for key, count in values.get("by_priority", {}).items()},
+            values.get("active_remaining", 0),
+        )
+
+    def as_dict(self) -> dict:
+        """Return the aggregate for storage."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def speeds_by_download(users) -> dict:
+    """Sum the speed of the download sources per download id."""
+    speeds = {}
+    for user in users:
+        speeds[user.downloadid] = speeds.get(user.downloadid, 0) + user.speed
+    return speeds
+
+
+class DownloadProgress:
+    """Remaining bytes, percent complete and ETA of the downloads.
+
+    The totals come from the single pass of Aggregate.of_downloads, the
+    per-download values from the record and its speed, so every value is
+    O(1). The ETA only counts the active downloads, paused ones never end.
+    """
+
+    __slots__ = ("_downloads", "_speeds", "size", "ready", "active_remaining", "speed")
+
+    def __init__(self, stats: Aggregate, downloads, speeds: dict):
+        """Init."""
+        self._downloads = downloads
+        self._speeds = speeds
+        self.size = stats.size
+        self.ready = stats.ready
+        self.active_remaining = stats.active_remaining
+        self.speed = sum(speeds.values())
+
+    @property
+    def remaining(self) -> int:
+        """Return the bytes all downloads still need."""
+        return max(0, self.size - self.ready)
+
+    @property
+    def percent(self) -> float | None:
+        """Return the percent complete over all downloads."""
+        if not self.size:
+            return None
+        return self.ready * 100 / self.size
+
+    @property
+    def eta(self) -> float | None:
+        """Return the seconds until the active downloads are complete at the current speed."""
+        return _eta(self.active_remaining, self.speed)
+
+    def download_remaining(self, download_id: str) -> int | None:
+        """Return the bytes one download still needs."""
+        download = self._downloads.get(download_id)
+        return max(0, download.size - download.ready) if download is not None else None
+
+    def download_eta(self, download_id: str) -> float | None:
+        """Return the seconds until one download is complete at its current speed."""
+        remaining = self.download_remaining(download_id)
+        return _eta(remaining, self._speeds.get(download_id, 0)) if remaining is not None else None
+
+
+def _eta(remaining: int, speed: int) -> float | None:
+    """Return the seconds to transfer the remaining bytes, None without speed."""
+    if remaining <= 0:
+        return 0.0
+    if not speed:
+        return None
+    return remaining / speed
+
+
+class AppleJuiceSnapshot:
+    """Immutable view of the core state published to the entities."""
+
+    __slots__ = (
+        "information",
+        "networkinfo",
+        "downloads",
+        "uploads",
+        "users",
+        "servers",
+        "shares",
+        "download_stats",
+        "upload_stats",
+        "share_stats",
+        "download_speeds",
+        "download_progress",
+        "stale",
+    )
+
+    def __init__(self, **fields):
+        """Init."""
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        """Snapshots must not change once published."""
+        raise AttributeError("AppleJuiceSnapshot is read-only")
+
+
+class ModifiedUpdate:
+    """Parser handler collecting the records of one modified.xml response.
+
+    The records are only applied to the state once the response is
+    complete and carried a <time>.
+    """
+
+    def __init__(self, full: bool):
+        """Init."""
+        self.full = full
+        self.time = None
+        self.information = None
+        self.networkinfo = None
+        self.objects = {tag: {} for tag in OBJECT_TAGS}
+        self.removed = []
+
+    def __call__(self, tag, attrib, text):
+        """Handle one closed element."""
+        record_type = OBJECT_TAGS.get(tag)
+        if record_type is not None:
+            self.objects[tag][attrib.get("id")] = record_type.from_attrib(attrib)
+        elif tag == "object":
+            self.removed.append(attrib.get("id"))
+        elif tag == "information":
+            self.information = InformationRecord.from_attrib(attrib)
+        elif tag == "networkinfo":
+            self.networkinfo = NetworkInfoRecord.from_attrib(attrib)
+        elif tag == "time" and text.isdigit():
+            self.time = int(text)
+
+
+class ShareUpdate:
+    """Parser handler collecting the shares of share.xml into an index builder."""
+
+    def __init__(self):
+        """Init."""
+        self.complete = False
+        self.builder = ShareIndexBuilder()
+        self.index = None
+
+    def __call__(self, tag, attrib, text):
+        """Handle one closed element."""
+        if tag == "share":
+            self.builder.add(_int(attrib.get("id")), _str(attrib.get("filename")), _str(attrib.get("checksum")),
+                             _int(attrib.get("size")), _int(attrib.get("priority")))
+        elif tag == "shares":
+            self.complete = True
+
+    def build(self, previous: ShareIndex | None = None) -> ShareIndex:
+        """Build the index of the shares once, reusing what did not change since the previous one."""
+        if self.index is None:
+            self.index = self.builder.build(previous)
+            self.builder = None
+        return self.index
+
+
+def diff_snapshots(previous: AppleJuiceSnapshot, current: AppleJuiceSnapshot,
+                   changed_downloads: set | None = None) -> frozenset:
+    """Return what changed between two snapshots.
+
+    information and networkinfo are compared per attribute and reported as
+    (section, attribute), the collections by identity as (section,). If the
+    ids of the changed downloads are known, the downloads are reported as
+    (download, id) instead.
+    """
+    changes = set()
+
+    for section in ("information", "networkinfo"):
+        old = getattr(previous, section)
+        new = getattr(current, section)
+        if old is not new:
+            changes.update(
+                (section, name) for name in new.__slots__ if getattr(old, name) != getattr(new, name)
+            )
+
+    for section, name in (
+            ("download", "downloads"),
+            ("upload", "uploads"),
+            ("user", "users"),
+            ("server", "servers"),
+            ("shares", "shares"),
+    ):
+        if getattr(previous, name) is getattr(current, name):
+            continue
+        if section == "download" and changed_downloads:
+            changes.update(("download", download_id) for download_id in changed_downloads)
+        else:
+            changes.add((section,))
+
+    changes.update((section,) for section in previous.stale ^ current.stale)
+
+    return frozenset(changes)
+
+
+class DeltaCursor:
+    """Session, timestamp and filter of one series of modified.xml deltas.
+
+    Every polling lane keeps its own cursor, so lanes with different
+    filters and intervals do not invalidate each other.
+    """
+
+    def __init__(self):
+        """Init."""
+        self.session = None
+        self.timestamp = 0
+        self.filter = None
+
+    @property
+    def synced(self) -> bool:
+        """Return True once a full modified.xml has been applied."""
+        return self.timestamp > 0
+
+    def invalidate(self) -> None:
+        """Forget the delta position, the next fetch will be a full resync.
+
+        The objects are kept until the full response replaces them, so a
+        single failed poll does not blank out the entities.
+        """
+        self.session = None
+        self.timestamp = 0
+
+    def use_filter(self, filters: frozenset) -> None:
+        """Set the modified.xml filter, resync if it asks for more than the last one.
+
+        None, or all filters, requests modified.xml without filter.
+        """
+        if filters == ALL_FILTERS:
+            filters = None
+        if self.filter is not None and (filters is None or not filters <= self.filter):
+            _LOGGER.debug("modified.xml filter extended to %s, full resync", filters)
+            self.invalidate()
+        self.filter = filters
+
+    def covers(self, tag: str) -> bool:
+        """Return True if the filter delivers the section."""
+        return self.filter is None or MODIFIED_FILTERS[tag] in self.filter
+
+    def params(self) -> dict:
+        """Return the query parameters for the next modified.xml request."""
+        params = {"timestamp": self.timestamp}
+        if self.session is not None:
+            params["session"] = self.session
+        if self.filter is not None:
+            params["filter"] = ";".join(sorted(self.filter))
+        return params
+
+    def as_dict(self) -> dict:
+        """Return the cursor for diagnostics."""
+        return {
+            "synced": self.synced,
+            "timestamp": self.timestamp,
+            "filter": sorted(self.filter) if self.filter is not None else None,
+        }
+
+
+class AppleJuiceState:
+    """Mirror of the core objects, kept up to date from modified.xml deltas."""
+
+    def __init__(self):
+        """Init."""
+        self.information = EMPTY_INFORMATION
+        self.networkinfo = EMPTY_NETWORKINFO
+        self.objects = {tag: {} for tag in OBJECT_TAGS}
+        self.shares = EMPTY_SHARE_INDEX
+        self.stale = frozenset()
+        self.loaded = set()
+        self.restored = {}
+        self.changed_downloads = set()
+        self._views = {}
+        self._aggregates = {}
+        self._snapshot = None
+
+    def apply_modified(self, update, cursor: DeltaCursor) -> bool:
+        """Apply a parsed modified.xml response of the cursor in place.
+
+        A full response replaces the collections the cursor's filter
+        delivers. Returns False if the response carries no <time>, which
+        the core does when the session or timestamp is no longer valid.
+        """
+        if update.time is None:
+            return False
+
+        if update.full:
+            for tag, objects in update.objects.items():
+                if cursor.covers(tag):
+                    self.objects[tag] = objects
+                    self._views.pop(tag, None)
+                    self.loaded.add(tag)
+                    self.restored.pop(tag, None)
+                    if tag == "download":
+                        self.changed_downloads = None
+        else:
+            for object_id in update.removed:
+                for tag, objects in self.objects.items():
+                    if objects.pop(object_id, None) is not None:
+                        self._views.pop(tag, None)
+                        if tag == "download" and self.changed_downloads is not None:
+                            self.changed_downloads.add(object_id)
+
+            for tag, changed in update.objects.items():
+                objects = self.objects[tag]
+                modified = [object_id for object_id, record in changed.items() if objects.get(object_id) != record]
+                if modified:
+                    objects.update(changed)
+                    self._views.pop(tag, None)
+                    if tag == "download" and self.changed_downloads is not None:
+                        self.changed_downloads.update(modified)
+
+        if update.information is not None:
+            self.loaded.add("information")
+            if update.information != self.information:
+                self.information = update.information
+        if update.networkinfo is not None:
+            self.loaded.add("networkinfo")
+            if update.networkinfo != self.networkinfo:
+                self.networkinfo = update.networkinfo
+
+        cursor.timestamp = update.time
+        return True
+
+    def apply_share(self, update) -> None:
+        """Replace the shares with the index of share.xml, unless it was incomplete."""
+        if update.complete:
+            self.shares = update.build(self.shares)
+            self.loaded.add("shares")
+            self.restored.pop("shares", None)
+
+    def take_changed_downloads(self) -> set | None:
+        """Return the ids of the downloads changed or removed since the last call, None after a full resync."""
+        changed, self.changed_downloads = self.changed_downloads, set()
+        return changed
+
+    def restore(self, information, networkinfo, servers: dict, aggregates: dict) -> None:
+        """Start from a stored snapshot instead of empty collections.
+
+        The stored aggregates stand in for their collections until those
+        are loaded from the core, the records themselves are not stored.
+        """
+        self.information = information
+        self.networkinfo = networkinfo
+        self.objects["server"] = dict(servers)
+        self._views.pop("server", None)
+        self.restored = dict(aggregates)
+
+    def _view(self, tag):
+        """Return a read-only copy of one object collection, reused until it changes."""
+        view = self._views.get(tag)
+        if view is None:
+            view = self._views[tag] = MappingProxyType(dict(self.objects[tag]))
+        return view
+
+    def _aggregate(self, key, collection, build):
+        """Return the aggregate of a collection, rebuilt only if the collection was replaced."""
+        restored = self.restored.get(key)
+        if restored is not None:
+            return restored
+        cached = self._aggregates.get(key)
+        if cached is None or cached[0] is not collection:
+            cached = self._aggregates[key] = (collection, build(collection))
+        return cached[1]
+
+    def snapshot(self) -> AppleJuiceSnapshot:
+        """Return the current state as immutable snapshot.
+
+        The previous snapshot object is returned while nothing changed, so
+        the coordinator sees equal data and does not notify the entities.
+        """
+        downloads = self._view("download")
+        uploads = self._view("upload")
+        users = self._view("user")
+
+        fields = {
+            "information": self.information,
+            "networkinfo": self.networkinfo,
+            "downloads": downloads,
+            "uploads": uploads,
+            "users": users,
+            "servers": self._view("server"),
+            "shares": self.shares,
+            "stale": self.stale,
+        }
+
+        previous = self._snapshot
+        if previous is not None and all(getattr(previous, name) is value for name, value in fields.items()):
+            return previous
+
+        download_stats = self._aggregate("download", downloads, lambda d: Aggregate.of_downloads(d.values()))
+        download_speeds = self._aggregate("user", users, lambda u: speeds_by_download(u.values()))
+
+        self._snapshot = AppleJuiceSnapshot(
+            **fields,
+            download_stats=download_stats,
+            upload_stats=self._aggregate("upload", uploads, lambda u: Aggregate.of_uploads(u.values())),
+            share_stats=self._aggregate("shares", self.shares, Aggregate.of_shares),
+            download_speeds=download_speeds,
+            download_progress=DownloadProgress(download_stats, downloads, download_speeds),
+        )
+        return self._snapshot
@@ -0,0 +1,82 @@
+"""Streaming XML parsing for appleJuice Core responses."""
+
+import logging
+import time
+
+from defusedxml.ElementTree import XMLParser
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RecordTarget:
+    """Parser target that reports every closing element and keeps no tree.
+
+    The handler is called with (tag, attrib, text) as soon as an element
+    closes. Only the text of leaf elements is collected, everything else
+    is dropped, so memory does not grow with the size of the document.
+    """
+
+    def __init__(self, handler):
+        """Init."""
+        self._handler = handler
+        self._attribs = []
+        self._text = []
+
+    def start(self, tag, attrib):
+        """Remember the attributes until the element closes."""
+        self._attribs.append(attrib)
+        self._text.clear()
+
+    def data(self, data):
+        """Collect character data of the current element."""
+        self._text.append(data)
+
+    def end(self, tag):
+        """Hand the closed element to the handler."""
+        text = "".join(self._text).strip()
+        self._text.clear()
+        self._handler(tag, self._attribs.pop(), text)
+
+    def close(self):
+        """Nothing to return, the handler got everything."""
+        return None
+
+
+class StreamParser:
+    """Incremental, defused parser fed with response chunks.
+
+    size counts the fed bytes and busy the seconds spent parsing them,
+    loop_busy only the part before the caller moved feeding to an executor.
+    """
+
+    def __init__(self, handler):
+        """Init."""
+        self._parser = XMLParser(target=RecordTarget(handler))
+        self.size = 0
+        self.busy = 0.0
+        self.offloaded = False
+        self._loop_busy = 0.0
+
+    @property
+    def loop_busy(self) -> float:
+        """Return the seconds spent parsing on the calling event loop."""
+        return self._loop_busy if self.offloaded else self.busy
+
+    def offload(self) -> None:
+        """Mark that the following chunks are fed from an executor."""
+        if not self.offloaded:
+            self._loop_busy = self.busy
+            self.offloaded = True
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the document."""
+        start = time.perf_counter()
+        self.size += len(chunk)
+        self._parser.feed(chunk)
+        self.busy += time.perf_counter() - start
+
+    def close(self) -> None:
+        """Finish the document, raises ParseError if it is incomplete."""
+        start = time.perf_counter()
+        self._parser.close()
+        self.busy += time.perf_counter() - start
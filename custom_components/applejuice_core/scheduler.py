@@ -0,0 +1,157 @@
+"""Adaptive polling intervals, lanes and circuit breaker of one appleJuice Core."""
+
+import logging
+import random
+from datetime import timedelta
+
+from .const import (
+    BACKOFF_FACTOR,
+    POLLING_JITTER,
+    BREAKER_THRESHOLD,
+    BREAKER_BACKOFF,
+    BREAKER_BACKOFF_MAX,
+)
+from .model import DeltaCursor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def is_active(snapshot) -> bool:
+    """Return True while the core is transferring data."""
+    if snapshot is None or snapshot.networkinfo.paused:
+        return False
+    information = snapshot.information
+    return information.downloadspeed > 0 or information.uploadspeed > 0
+
+
+class AdaptiveInterval:
+    """Polling interval that is short while transfers are active.
+
+    While idle, paused or unreachable the interval backs off from the base
+    rate by BACKOFF_FACTOR up to the maximum. Every interval gets a random
+    jitter within the bounds, so several cores do not poll in lockstep.
+    """
+
+    def __init__(self, base: float, minimum: float, maximum: float, jitter: float = POLLING_JITTER):
+        """Init."""
+        self.minimum, self.base, self.maximum = sorted((minimum, base, maximum))
+        self.jitter = jitter
+        self.current = self.base
+
+    def next(self, active: bool) -> timedelta:
+        """Return the interval until the next poll."""
+        if active:
+            self.current = self.minimum
+        else:
+            self.current = min(max(self.current * BACKOFF_FACTOR, self.base), self.maximum)
+
+        low = max(self.current * (1 - self.jitter), self.minimum)
+        high = min(self.current * (1 + self.jitter), self.maximum)
+        return timedelta(seconds=random.uniform(low, high))
+
+
+class Lane:
+    """Sections polled together on their own interval.
+
+    Cheap, fast changing sections get a short interval and heavy lists a
+    long one. A modified.xml lane keeps its own delta cursor.
+    """
+
+    def __init__(self, name: str, sections, updater, interval: AdaptiveInterval):
+        """Init."""
+        self.name = name
+        self.sections = frozenset(sections)
+        self.updater = updater
+        self.interval = interval
+        self.cursor = DeltaCursor()
+        self.due = 0.0
+        self.polls = 0
+
+    def schedule(self, now: float, active: bool) -> None:
+        """Set the next due time after a poll of the lane."""
+        self.polls += 1
+        self.due = now + self.interval.next(active).total_seconds()
+
+    def as_dict(self, now: float) -> dict:
+        """Return the lane for diagnostics."""
+        return {
+            "sections": sorted(self.sections),
+            "interval": round(self.interval.current, 1),
+            "due_in": round(max(self.due - now, 0.0), 1),
+            "polls": self.polls,
+            "cursor": self.cursor.as_dict(),
+        }
+
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops polling a core that does not answer.
+
+    After BREAKER_THRESHOLD failed polls in a row the breaker opens and no
+    request is sent for the backoff time. Then it is half-open: one cheap
+    probe decides whether the next poll runs, which closes the breaker on
+    success, or whether it opens again with BACKOFF_FACTOR times the
+    backoff, up to BREAKER_BACKOFF_MAX.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, backoff: float = BREAKER_BACKOFF,
+                 maximum: float = BREAKER_BACKOFF_MAX):
+        """Init."""
+        self.threshold = threshold
+        self.initial_backoff = backoff
+        self.maximum = maximum
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.backoff = backoff
+        self.retry_at = 0.0
+        self.opened = 0
+
+    @property
+    def open(self) -> bool:
+        """Return True while no request is sent to the core."""
+        return self.state == BREAKER_OPEN
+
+    def allow(self, now: float) -> bool:
+        """Return True if a request may be sent, an open breaker turns half-open once the backoff passed."""
+        if self.state == BREAKER_OPEN and now >= self.retry_at:
+            self.state = BREAKER_HALF_OPEN
+        return not self.open
+
+    def retry_in(self, now: float) -> float:
+        """Return the seconds until the next probe."""
+        return max(self.retry_at - now, 0.0)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll."""
+        if self.state != BREAKER_CLOSED:
+            _LOGGER.info("core reachable again, circuit breaker closed")
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.backoff = self.initial_backoff
+
+    def record_failure(self, now: float) -> None:
+        """Count a failed poll or probe, open the breaker at the threshold or when a probe failed."""
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN:
+            self.backoff = min(self.backoff * BACKOFF_FACTOR, self.maximum)
+        elif self.state == BREAKER_CLOSED and self.failures < self.threshold:
+            return
+
+        if self.state == BREAKER_CLOSED:
+            self.opened += 1
+        self.state = BREAKER_OPEN
+        self.retry_at = now + self.backoff
+
+    def as_dict(self, now: float) -> dict:
+        """Return the breaker for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "backoff": self.backoff,
+            "retry_in": round(self.retry_in(now), 1) if self.open else None,
+            "opened": self.opened,
+        }
@@ -1,15 +1,21 @@
 import logging
+import re
 from dataclasses import dataclass
+from fnmatch import translate
 from collections.abc import Callable
 from datetime import datetime
 
 from homeassistant.const import (
+    PERCENTAGE,
     EntityCategory,
     UnitOfInformation,
     UnitOfDataRate,
+    UnitOfTime,
 )
 
 from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -18,7 +24,19 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_OPTION_DOWNLOAD_ENTITIES,
+    CONF_OPTION_DOWNLOAD_ENTITIES_LIMIT,
+    CONF_OPTION_DOWNLOAD_ENTITIES_FILTER,
+    DEFAULT_DOWNLOAD_ENTITIES_LIMIT,
+    WRITE_LIMIT_SENSORS,
+    DOWNLOAD_STATUS_ACTIVE,
+    DOWNLOAD_STATUS_READY,
+    DOWNLOAD_STATUS_PAUSED,
+    DOWNLOAD_STATUS_NAMES,
+)
+from .deadband import WriteFilter
 from .entity import BaseAppleJuiceCoreEntity, BaseAppleJuiceNetworkEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,7 +67,7 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.TOTAL_INCREASING,
         subscriptions=[("information", "credits")],
-        value_fn=lambda sensor: round(int(sensor.coordinator.data.find("information").attrib.get("credits", "0")) / (1024 ** 3), 2),
+        value_fn=lambda sensor: round(sensor.coordinator.data.information.credits / (1024 ** 3), 2),
     ),
     AppleJuiceBaseSensorDescription(
         key="sessionupload",
@@ -59,7 +77,7 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
         subscriptions=[("information", "sessionupload")],
-        value_fn=lambda sensor: round(int(sensor.coordinator.data.find("information").attrib.get("sessionupload", "0")) / (1024 ** 3), 2),
+        value_fn=lambda sensor: round(sensor.coordinator.data.information.sessionupload / (1024 ** 3), 2),
     ),
     AppleJuiceBaseSensorDescription(
         key="sessiondownload",
@@ -69,7 +87,7 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
         subscriptions=[("information", "sessiondownload")],
-        value_fn=lambda sensor: round(int(sensor.coordinator.data.find("information").attrib.get("sessiondownload", "0")) / (1024 ** 3), 2),
+        value_fn=lambda sensor: round(sensor.coordinator.data.information.sessiondownload / (1024 ** 3), 2),
     ),
     AppleJuiceBaseSensorDescription(
         key="uploadspeed",
@@ -79,7 +97,7 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         device_class=SensorDeviceClass.DATA_RATE,
         state_class=SensorStateClass.MEASUREMENT,
         subscriptions=[("information", "uploadspeed")],
-        value_fn=lambda sensor: round(int(sensor.coordinator.data.find("information").attrib.get("uploadspeed", "0")) / (1024 ** 2), 2),
+        value_fn=lambda sensor: round(sensor.coordinator.data.information.uploadspeed / (1024 ** 2), 2),
     ),
     AppleJuiceBaseSensorDescription(
         key="downloadspeed",
@@ -89,7 +107,7 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         device_class=SensorDeviceClass.DATA_RATE,
         state_class=SensorStateClass.MEASUREMENT,
         subscriptions=[("information", "downloadspeed")],
-        value_fn=lambda sensor: round(int(sensor.coordinator.data.find("information").attrib.get("downloadspeed", "0")) / (1024 ** 2), 2),
+        value_fn=lambda sensor: round(sensor.coordinator.data.information.downloadspeed / (1024 ** 2), 2),
     ),
     AppleJuiceBaseSensorDescription(
         key="openconnections",
@@ -97,65 +115,84 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         icon="mdi:connection",
         state_class=SensorStateClass.TOTAL,
         subscriptions=[("information", "openconnections")],
-        value_fn=lambda sensor: sensor.coordinator.data.find("information").attrib.get("openconnections", "0"),
+        value_fn=lambda sensor: sensor.coordinator.data.information.openconnections,
     ),
     AppleJuiceBaseSensorDescription(
         key="downloads_total",
         name="Downloads Total",
         icon="mdi:download-multiple",
         state_class=SensorStateClass.TOTAL,
-        subscriptions=[("download")],
-        value_fn=lambda sensor: len(sensor.coordinator.data.findall("download")),
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: sensor.coordinator.data.download_stats.count,
     ),
     AppleJuiceBaseSensorDescription(
         key="downloads_active",
         name="Downloads Active",
         icon="mdi:download-multiple",
         state_class=SensorStateClass.TOTAL,
-        subscriptions=[("download")],
-        value_fn=lambda sensor: len([
-            d for d in sensor.coordinator.data.findall("download")
-            if d.attrib.get("status") == "0"
-        ]),
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: sensor.coordinator.data.download_stats.by_status.get(DOWNLOAD_STATUS_ACTIVE, 0),
     ),
     AppleJuiceBaseSensorDescription(
         key="downloads_ready",
         name="Downloads ready",
         icon="mdi:download-multiple",
         state_class=SensorStateClass.TOTAL,
-        subscriptions=[("download")],
-        value_fn=lambda sensor: len([
-            d for d in sensor.coordinator.data.findall("download")
-            if d.attrib.get("status") == "14"
-        ]),
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: sensor.coordinator.data.download_stats.by_status.get(DOWNLOAD_STATUS_READY, 0),
     ),
     AppleJuiceBaseSensorDescription(
         key="downloads_paused",
         name="Downloads paused",
         icon="mdi:download-multiple",
         state_class=SensorStateClass.TOTAL,
-        subscriptions=[("download")],
-        value_fn=lambda sensor: len([
-            d for d in sensor.coordinator.data.findall("download")
-            if d.attrib.get("status") == "18"
-        ]),
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: sensor.coordinator.data.download_stats.by_status.get(DOWNLOAD_STATUS_PAUSED, 0),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="downloads_remaining",
+        name="Downloads Remaining",
+        icon="mdi:download-outline",
+        unit=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: round(sensor.coordinator.data.download_progress.remaining / (1024 ** 3), 2),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="downloads_progress",
+        name="Downloads Progress",
+        icon="mdi:progress-download",
+        unit=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: _round(sensor.coordinator.data.download_progress.percent, 1),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="downloads_eta",
+        name="Downloads ETA",
+        icon="mdi:timer-sand",
+        unit=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        subscriptions=[("download",), ("user",)],
+        value_fn=lambda sensor: _round(sensor.coordinator.data.download_progress.eta),
     ),
     AppleJuiceBaseSensorDescription(
         key="uploads",
         name="Uploads",
         icon="mdi:upload-multiple",
         device_class=SensorStateClass.TOTAL,
-        subscriptions=[("upload")],
-        value_fn=lambda sensor: len(sensor.coordinator.data.findall("upload")),
+        subscriptions=[("upload",)],
+        value_fn=lambda sensor: sensor.coordinator.data.upload_stats.count,
     ),
     AppleJuiceBaseSensorDescription(
         key="connected_server_name",
         name="Connected Server",
         icon="mdi:server-network",
         device_class=SensorStateClass.TOTAL,
-        subscriptions=[("networkinfo")],
+        subscriptions=[("networkinfo", "connectedwithserverid"), ("server",)],
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda sensor: sensor.coordinator.data.find("server[@id='{}']".format(sensor.coordinator.data.find("networkinfo").attrib.get("connectedwithserverid", ""))).attrib.get("host", "Unknown"),
+        value_fn=lambda sensor: getattr(sensor.coordinator.data.servers.get(sensor.coordinator.data.networkinfo.connectedwithserverid), "host", "Unknown"),
     ),
     AppleJuiceBaseSensorDescription(
         key="connectedsince",
@@ -164,15 +201,15 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         device_class=SensorDeviceClass.DATE,
         subscriptions=[("networkinfo", "connectedsince")],
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda sensor: datetime.fromtimestamp(int(sensor.coordinator.data.find("networkinfo").attrib.get("connectedsince", "0")) / 1000.0),
+        value_fn=lambda sensor: datetime.fromtimestamp(sensor.coordinator.data.networkinfo.connectedsince / 1000.0),
     ),
     AppleJuiceBaseSensorDescription(
         key="shared_files",
         name="Shared Files",
         icon="mdi:folder-file-outline",
         device_class=SensorStateClass.TOTAL,
-        subscriptions=[("shares")],
-        value_fn=lambda sensor: len(sensor.coordinator.data.find("shares").findall("share")),
+        subscriptions=[("shares",)],
+        value_fn=lambda sensor: sensor.coordinator.data.share_stats.count,
     ),
     AppleJuiceBaseSensorDescription(
         key="shared_size",
@@ -180,8 +217,8 @@ SENSORS_CORE: tuple[AppleJuiceBaseSensorDescription, ...] = [
         icon="mdi:file-outline",
         unit=UnitOfInformation.GIGABYTES,
         device_class=SensorDeviceClass.DATA_SIZE,
-        subscriptions=[("shares")],
-        value_fn=lambda sensor: round(sum(int(share.attrib.get("size", 0)) for share in sensor.coordinator.data.find("shares").findall("share")) / (1024 ** 3), 2),
+        subscriptions=[("shares",)],
+        value_fn=lambda sensor: round(sensor.coordinator.data.share_stats.size / (1024 ** 3), 2),
     ),
 ]
 
@@ -192,7 +229,7 @@ SENSORS_NETWORK: tuple[AppleJuiceBaseSensorDescription, ...] = [
         icon="mdi:account-group",
         state_class=SensorStateClass.TOTAL,
         subscriptions=[("networkinfo", "users")],
-        value_fn=lambda sensor: sensor.coordinator.data.find("networkinfo").attrib.get("users", "0"),
+        value_fn=lambda sensor: sensor.coordinator.data.networkinfo.users,
     ),
     AppleJuiceBaseSensorDescription(
         key="global_files",
@@ -200,7 +237,7 @@ SENSORS_NETWORK: tuple[AppleJuiceBaseSensorDescription, ...] = [
         icon="mdi:folder-file-outline",
         state_class=SensorStateClass.TOTAL,
         subscriptions=[("networkinfo", "files")],
-        value_fn=lambda sensor: sensor.coordinator.data.find("networkinfo").attrib.get("files", "0"),
+        value_fn=lambda sensor: sensor.coordinator.data.networkinfo.files,
     ),
     AppleJuiceBaseSensorDescription(
         key="global_file_size",
@@ -208,15 +245,239 @@ SENSORS_NETWORK: tuple[AppleJuiceBaseSensorDescription, ...] = [
         unit=UnitOfInformation.TERABYTES,
         device_class=SensorDeviceClass.DATA_SIZE,
         subscriptions=[("networkinfo", "filesize")],
-        value_fn=lambda sensor: round(float(sensor.coordinator.data.find("networkinfo").attrib.get("filesize", "0").replace(",", ".")) / (1024 ** 2), 2),
+        value_fn=lambda sensor: round(sensor.coordinator.data.networkinfo.filesize / (1024 ** 2), 2),
     ),
     AppleJuiceBaseSensorDescription(
         key="known_servers",
         name="Known Servers",
         icon="mdi:server",
         state_class=SensorStateClass.TOTAL,
-        subscriptions=[("server")],
-        value_fn=lambda sensor: len(sensor.coordinator.data.findall("server")),
+        subscriptions=[("server",)],
+        value_fn=lambda sensor: len(sensor.coordinator.data.servers),
+    ),
+]
+
+# rates from the session counters and percentiles of the reported speeds over the throughput window
+SENSORS_THROUGHPUT: tuple[AppleJuiceBaseSensorDescription, ...] = [
+    AppleJuiceBaseSensorDescription(
+        key="upload_rate",
+        name="Upload Rate",
+        icon="mdi:upload",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessionupload"), ("throughput", "upload")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.upload.rate),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="upload_rate_average",
+        name="Upload Rate Average",
+        icon="mdi:upload",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessionupload"), ("throughput", "upload")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.upload.rate_average),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="upload_speed_median",
+        name="Upload Speed Median",
+        icon="mdi:upload",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessionupload"), ("throughput", "upload")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.upload.percentile(50)),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="upload_speed_p95",
+        name="Upload Speed P95",
+        icon="mdi:upload",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessionupload"), ("throughput", "upload")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.upload.percentile(95)),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="download_rate",
+        name="Download Rate",
+        icon="mdi:download",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessiondownload"), ("throughput", "download")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.download.rate),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="download_rate_average",
+        name="Download Rate Average",
+        icon="mdi:download",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessiondownload"), ("throughput", "download")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.download.rate_average),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="download_speed_median",
+        name="Download Speed Median",
+        icon="mdi:download",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessiondownload"), ("throughput", "download")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.download.percentile(50)),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="download_speed_p95",
+        name="Download Speed P95",
+        icon="mdi:download",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("information", "sessiondownload"), ("throughput", "download")],
+        value_fn=lambda sensor: _megabytes_per_second(sensor.coordinator.throughput.download.percentile(95)),
+    ),
+]
+
+SENSORS_TELEMETRY: tuple[AppleJuiceBaseSensorDescription, ...] = [
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_update_duration",
+        name="Update Duration",
+        icon="mdi:timer-outline",
+        unit=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: _milliseconds(sensor.coordinator.telemetry.update_duration.last),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_loop_busy",
+        name="Event Loop Busy",
+        icon="mdi:timer-sand",
+        unit=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: _milliseconds(sensor.coordinator.telemetry.loop_busy.last),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_entities_written",
+        name="Entities Written",
+        icon="mdi:pencil-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: sensor.coordinator.telemetry.entities_written.last,
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_writes_suppressed",
+        name="Writes Suppressed",
+        icon="mdi:pencil-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: sum(sensor.coordinator.suppressed_writes.values()),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_modified_latency",
+        name="Modified Latency",
+        icon="mdi:timer-outline",
+        unit=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: _milliseconds(sensor.coordinator.telemetry.endpoint("/xml/modified.xml").latency.percentile(95)),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_modified_size",
+        name="Modified Size",
+        icon="mdi:file-download-outline",
+        unit=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: sensor.coordinator.telemetry.endpoint("/xml/modified.xml").size.last,
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_modified_parse_time",
+        name="Modified Parse Time",
+        icon="mdi:timer-cog-outline",
+        unit=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: _milliseconds(sensor.coordinator.telemetry.endpoint("/xml/modified.xml").parse_time.last),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_share_latency",
+        name="Share Latency",
+        icon="mdi:timer-outline",
+        unit=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: _milliseconds(sensor.coordinator.telemetry.endpoint("/xml/share.xml").latency.percentile(95)),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="telemetry_share_parse_time",
+        name="Share Parse Time",
+        icon="mdi:timer-cog-outline",
+        unit=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("telemetry",)],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda sensor: _milliseconds(sensor.coordinator.telemetry.endpoint("/xml/share.xml").parse_time.last),
+    ),
+]
+
+SENSORS_DOWNLOAD: tuple[AppleJuiceBaseSensorDescription, ...] = [
+    AppleJuiceBaseSensorDescription(
+        key="progress",
+        name="Progress",
+        icon="mdi:progress-download",
+        unit=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: round(sensor.download.ready * 100 / sensor.download.size, 1) if sensor.download.size else 0.0,
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="speed",
+        name="Speed",
+        icon="mdi:download",
+        unit=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        subscriptions=[("download",), ("user",)],
+        value_fn=lambda sensor: round(sensor.coordinator.data.download_speeds.get(sensor.download_id, 0) / (1024 ** 2), 2),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="eta",
+        name="ETA",
+        icon="mdi:timer-sand",
+        unit=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        subscriptions=[("download",), ("user",)],
+        value_fn=lambda sensor: _round(sensor.coordinator.data.download_progress.download_eta(sensor.download_id)),
+    ),
+    AppleJuiceBaseSensorDescription(
+        key="status",
+        name="Status",
+        icon="mdi:list-status",
+        device_class=SensorDeviceClass.ENUM,
+        subscriptions=[("download",)],
+        value_fn=lambda sensor: DOWNLOAD_STATUS_NAMES.get(sensor.download.status, "unknown"),
     ),
 ]
 
@@ -227,16 +488,98 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
     await async_setup_basic_sensor(coordinator, entry, async_add_entities)
 
+    await async_setup_download_sensor(hass, coordinator, entry, async_add_entities)
+
 
 async def async_setup_basic_sensor(coordinator, entry, async_add_entities):
     """Set basic sensor platform."""
     async_add_entities(
-        [AppleJuiceCoreSensor(coordinator, entry, desc) for desc in SENSORS_CORE] +
+        [AppleJuiceCoreSensor(coordinator, entry, desc) for desc in SENSORS_CORE + SENSORS_THROUGHPUT + SENSORS_TELEMETRY] +
         [AppleJuiceNetworkSensor(coordinator, entry, desc) for desc in SENSORS_NETWORK]
     )
 
 
-class AppleJuiceCoreSensor(BaseAppleJuiceCoreEntity, SensorEntity):
+def _round(value: float | None, digits: int | None = None) -> float | None:
+    """Round a value that is None while unknown."""
+    return round(value, digits) if value is not None else None
+
+
+def _megabytes_per_second(rate: float | None) -> float | None:
+    """Return bytes per second as rounded megabytes per second."""
+    return round(rate / (1024 ** 2), 2) if rate is not None else None
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Return seconds as rounded milliseconds."""
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _write_filter(description, options) -> WriteFilter | None:
+    """Return the write filter of a high-churn sensor with write limits, None for the other sensors."""
+    if description.key not in WRITE_LIMIT_SENSORS:
+        return None
+    return WriteFilter.from_options(description.key, options)
+
+
+class RateLimitedSensorMixin:
+    """Writes the values of a high-churn sensor only as often as its write filter allows."""
+
+    _write_filter: WriteFilter | None = None
+    _cancel_write = None
+    _written_available = None
+
+    async def async_added_to_hass(self) -> None:
+        """Count the initial state as written."""
+        await super().async_added_to_hass()
+        if self._write_filter is not None:
+            self._write_filter.written(self._attr_native_value, self.hass.loop.time())
+            self._written_available = self.available
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a held back write."""
+        await super().async_will_remove_from_hass()
+        self._cancel_pending_write()
+
+    def _cancel_pending_write(self) -> None:
+        """Cancel the timer of a held back value."""
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    @callback
+    def _async_write_value(self, value, force: bool = False) -> None:
+        """Write the value, unless the write filter holds it back until later or drops it.
+
+        A change of the availability is always written at once.
+        """
+        write_filter = self._write_filter
+        if write_filter is None:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+            return
+
+        self._cancel_pending_write()
+        now = self.hass.loop.time()
+        delay = 0 if force else write_filter.delay(value, now)
+        if delay == 0 or self.available != self._written_available:
+            self._attr_native_value = value
+            self._written_available = self.available
+            write_filter.written(value, now)
+            self.async_write_ha_state()
+            return
+
+        write_filter.suppressed += 1
+        self.coordinator.suppressed_writes[self.entity_description.key] += 1
+        if delay is not None:
+            @callback
+            def _async_write_later(_now) -> None:
+                self._cancel_write = None
+                self._async_write_value(value, force=True)
+
+            self._cancel_write = async_call_later(self.hass, delay, _async_write_later)
+
+
+class AppleJuiceCoreSensor(RateLimitedSensorMixin, BaseAppleJuiceCoreEntity, SensorEntity):
     """AppleJuiceCoreSensor Sensor class."""
 
     def __init__(self, coordinator, entry, description):
@@ -250,15 +593,15 @@ class AppleJuiceCoreSensor(BaseAppleJuiceCoreEntity, SensorEntity):
         self._attr_native_value = description.value_fn(self)
         self._attr_icon = description.icon
         self._attr_native_unit_of_measurement = description.unit
+        self._write_filter = _write_filter(description, entry.options)
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.entity_description.value_fn(self)
-        self.async_write_ha_state()
+        """Handle updated data from the coordinator, rate limited by the write filter."""
+        self._async_write_value(self.entity_description.value_fn(self))
 
 
-class AppleJuiceNetworkSensor(BaseAppleJuiceNetworkEntity, SensorEntity):
+class AppleJuiceNetworkSensor(RateLimitedSensorMixin, BaseAppleJuiceNetworkEntity, SensorEntity):
     """AppleJuiceCoreSensor Sensor class."""
 
     def __init__(self, coordinator, entry, description):
@@ -272,9 +615,122 @@ class AppleJuiceNetworkSensor(BaseAppleJuiceNetworkEntity, SensorEntity):
         self._attr_native_value = description.value_fn(self)
         self._attr_icon = description.icon
         self._attr_native_unit_of_measurement = description.unit
+        self._write_filter = _write_filter(description, entry.options)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, rate limited by the write filter."""
+        self._async_write_value(self.entity_description.value_fn(self))
+
+
+async def async_setup_download_sensor(hass, coordinator, entry, async_add_entities):
+    """Set per-download sensors, added and removed by diffing the download ids."""
+    registry = er.async_get(hass)
+    prefix = f"{entry.entry_id}_download_"
+
+    if not entry.options.get(CONF_OPTION_DOWNLOAD_ENTITIES, False):
+        for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+            if registry_entry.unique_id.startswith(prefix):
+                registry.async_remove(registry_entry.entity_id)
+        return
+
+    limit = entry.options.get(CONF_OPTION_DOWNLOAD_ENTITIES_LIMIT, DEFAULT_DOWNLOAD_ENTITIES_LIMIT)
+    pattern = entry.options.get(CONF_OPTION_DOWNLOAD_ENTITIES_FILTER) or "*"
+    matches = re.compile(translate(pattern), re.IGNORECASE).match
+    tracked = {}
+    last_downloads = None
+
+    @callback
+    def _async_sync_downloads() -> None:
+        """Add and remove download sensors for the changed download ids only.
+
+        Nothing is synced before the downloads were loaded from the core, a
+        restored snapshot only holds their aggregate.
+        """
+        nonlocal last_downloads
+        if "download" not in coordinator.state.loaded:
+            return
+        downloads = coordinator.data.downloads
+        if downloads is last_downloads:
+            return
+        first_sync = last_downloads is None
+        last_downloads = downloads
+
+        candidates = [download_id for download_id, download in downloads.items() if matches(download.filename)]
+        wanted = [download_id for download_id in candidates if download_id in tracked]
+        wanted += [download_id for download_id in candidates if download_id not in tracked]
+        wanted = set(wanted[:limit])
+
+        for download_id in tracked.keys() - wanted:
+            for entity in tracked.pop(download_id):
+                if entity.registry_entry is not None:
+                    registry.async_remove(entity.entity_id)
+                else:
+                    hass.async_create_task(entity.async_remove(force_remove=True))
+
+        added = wanted - tracked.keys()
+        if added:
+            entities = []
+            for download_id in added:
+                tracked[download_id] = [
+                    AppleJuiceDownloadSensor(coordinator, entry, download_id, desc) for desc in SENSORS_DOWNLOAD
+                ]
+                entities += tracked[download_id]
+            async_add_entities(entities)
+
+        if first_sync:
+            # entities of downloads that vanished while Home Assistant was stopped
+            current = {f"{prefix}{download_id}_{desc.key}" for download_id in tracked for desc in SENSORS_DOWNLOAD}
+            for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+                if registry_entry.unique_id.startswith(prefix) and registry_entry.unique_id not in current:
+                    registry.async_remove(registry_entry.entity_id)
+
+    # the download sensors need the download section, even if no aggregate download sensor is enabled
+    entry.async_on_unload(coordinator.async_subscribe([("download",)]))
+
+    _async_sync_downloads()
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_sync_downloads))
+
+
+class AppleJuiceDownloadSensor(BaseAppleJuiceCoreEntity, SensorEntity):
+    """Sensor of a single download."""
+
+    def __init__(self, coordinator, entry, download_id, description):
+        """Init."""
+        super().__init__(coordinator, entry)
+        self.coordinator = coordinator
+        self.download_id = download_id
+        self._attr_unique_id = f"{entry.entry_id}_download_{download_id}_{description.key}"
+        self._attr_name = f"{self.download.filename} {description.name}"
+        self._attr_has_entity_name = True
+        self.entity_description = description
+        self._attr_native_value = description.value_fn(self)
+        self._attr_icon = description.icon
+        self._attr_native_unit_of_measurement = description.unit
+        if description.device_class == SensorDeviceClass.ENUM:
+            self._attr_options = list(DOWNLOAD_STATUS_NAMES.values()) + ["unknown"]
+
+    def _listener_context(self, subscriptions: frozenset) -> frozenset:
+        """Update only for changes of this download, not of every download."""
+        return frozenset(
+            ("download", self.download_id) if subscription == ("download",) else subscription
+            for subscription in subscriptions
+        )
+
+    @property
+    def download(self):
+        """Return the download record of this sensor."""
+        return self.coordinator.data.downloads.get(self.download_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True while the download exists."""
+        return super().available and self.download is not None
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.entity_description.value_fn(self)
+        if self.download is not None:
+            self._attr_native_value = self.entity_description.value_fn(self)
         self.async_write_ha_state()
@@ -0,0 +1,126 @@
+"""Services of the appleJuice Core integration."""
+
+import logging
+from itertools import islice
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DOWNLOAD_ID = "download_id"
+ATTR_POWERDOWNLOAD = "powerdownload"
+ATTR_CHECKSUM = "checksum"
+ATTR_FILENAME = "filename"
+ATTR_DIRECTORY = "directory"
+ATTR_RECURSIVE = "recursive"
+ATTR_LIMIT = "limit"
+
+SERVICE_PAUSE_DOWNLOAD = "pause_download"
+SERVICE_RESUME_DOWNLOAD = "resume_download"
+SERVICE_CANCEL_DOWNLOAD = "cancel_download"
+SERVICE_SET_POWERDOWNLOAD = "set_powerdownload"
+SERVICE_QUERY_SHARES = "query_shares"
+
+DOWNLOAD_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_DOWNLOAD_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+POWERDOWNLOAD_SCHEMA = DOWNLOAD_SCHEMA.extend(
+    {
+        vol.Required(ATTR_POWERDOWNLOAD): vol.All(vol.Coerce(int), vol.Range(min=0, max=49)),
+    }
+)
+
+QUERY_SHARES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Exclusive(ATTR_CHECKSUM, "query"): cv.string,
+        vol.Exclusive(ATTR_FILENAME, "query"): cv.string,
+        vol.Exclusive(ATTR_DIRECTORY, "query"): cv.string,
+        vol.Optional(ATTR_RECURSIVE, default=True): cv.boolean,
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    }
+)
+
+# service: (core function, schema, extra parameters of the function)
+DOWNLOAD_SERVICES = {
+    SERVICE_PAUSE_DOWNLOAD: ("pausedownload", DOWNLOAD_SCHEMA, ()),
+    SERVICE_RESUME_DOWNLOAD: ("resumedownload", DOWNLOAD_SCHEMA, ()),
+    SERVICE_CANCEL_DOWNLOAD: ("canceldownload", DOWNLOAD_SCHEMA, ()),
+    SERVICE_SET_POWERDOWNLOAD: ("setpowerdownload", POWERDOWNLOAD_SCHEMA, (ATTR_POWERDOWNLOAD,)),
+}
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall):
+    """Return the coordinator of the called core, the only one if no config entry is given."""
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    coordinators = {
+        entry.entry_id: hass.data[DOMAIN][entry.entry_id]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in hass.data.get(DOMAIN, {})
+    }
+
+    if entry_id is None and len(coordinators) == 1:
+        return next(iter(coordinators.values()))
+    if entry_id is None:
+        raise ServiceValidationError(f"{ATTR_CONFIG_ENTRY_ID} is required with {len(coordinators)} loaded cores")
+    if entry_id not in coordinators:
+        raise ServiceValidationError(f"appleJuice Core {entry_id} is not loaded")
+    return coordinators[entry_id]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the download and share services."""
+
+    async def async_handle_download_service(call: ServiceCall) -> None:
+        method, _, extra = DOWNLOAD_SERVICES[call.service]
+        coordinator = _get_coordinator(hass, call)
+        if coordinator.breaker.open:
+            raise HomeAssistantError(f"{coordinator.name} is unreachable")
+        params = {name: call.data[name] for name in extra}
+
+        failed = await coordinator.commands.async_send(method, call.data[ATTR_DOWNLOAD_ID], params)
+        if failed:
+            raise HomeAssistantError(f"{method} failed for downloads {', '.join(failed)}")
+
+    for service, (_, schema, _) in DOWNLOAD_SERVICES.items():
+        hass.services.async_register(DOMAIN, service, async_handle_download_service, schema=schema)
+
+    @callback
+    def async_handle_query_shares(call: ServiceCall) -> ServiceResponse:
+        """Answer a share query from the share index, without a request to the core."""
+        coordinator = _get_coordinator(hass, call)
+        if "shares" not in coordinator.state.loaded:
+            raise HomeAssistantError("the shares of the core are not loaded yet")
+
+        index = coordinator.state.shares
+        if ATTR_CHECKSUM in call.data:
+            positions = index.find_checksum(call.data[ATTR_CHECKSUM])
+        elif ATTR_FILENAME in call.data:
+            positions = index.find_path(call.data[ATTR_FILENAME])
+        elif ATTR_DIRECTORY in call.data:
+            positions = index.in_directory(call.data[ATTR_DIRECTORY], call.data[ATTR_RECURSIVE])
+        else:
+            positions = index.largest()
+
+        limit = call.data[ATTR_LIMIT]
+        shares = [index.entry(position) for position in islice(positions, limit + 1)]
+        return {
+            "shares": shares[:limit],
+            "truncated": len(shares) > limit,
+            "total_files": len(index),
+        }
+
+    hass.services.async_register(DOMAIN, SERVICE_QUERY_SHARES, async_handle_query_shares,
+                                 schema=QUERY_SHARES_SCHEMA, supports_response=SupportsResponse.ONLY)
@@ -0,0 +1,227 @@
+"""Compact, searchable index of the files shared by an appleJuice Core."""
+
+import logging
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECKSUM_SIZE = 16
+NO_CHECKSUM = bytes(CHECKSUM_SIZE)
+
+# path separators of cores on Unix and Windows
+SEPARATORS = ("/", "\\")
+
+
+def split_path(filename: str) -> tuple[str, str]:
+    """Split a shared filename into directory, with its trailing separator, and name."""
+    cut = max(filename.rfind(separator) for separator in SEPARATORS) + 1
+    return filename[:cut], filename[cut:]
+
+
+def _order(keys, reverse: bool = False) -> array:
+    """Return the positions of the keys in sorted order."""
+    return array("l", sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse))
+
+
+def _sorted_keys(keys, order) -> array:
+    """Return the keys in the given order."""
+    return array(keys.typecode, map(keys.__getitem__, order))
+
+
+class ShareIndexBuilder:
+    """Collects the shares of one share.xml as columns, without a record per share."""
+
+    def __init__(self):
+        """Init."""
+        self.ids = array("q")
+        self.directory_of = array("l")
+        self.names = bytearray()
+        self.name_ends = array("q")
+        self.path_hashes = array("q")
+        self.sizes = array("q")
+        self.priorities = array("H")
+        self.checksums = bytearray()
+        self.directories = {}
+
+    def add(self, share_id: int, filename: str, checksum: str, size: int, priority: int) -> None:
+        """Add one share."""
+        directory, name = split_path(filename)
+        self.ids.append(share_id)
+        self.directory_of.append(self.directories.setdefault(directory, len(self.directories)))
+        self.names += name.encode("utf-8", "surrogatepass")
+        self.name_ends.append(len(self.names))
+        self.path_hashes.append(hash(filename))
+        self.sizes.append(size)
+        self.priorities.append(max(0, min(priority, 0xFFFF)))
+        try:
+            raw = bytes.fromhex(checksum)
+        except ValueError:
+            raw = NO_CHECKSUM
+        self.checksums += raw if len(raw) == CHECKSUM_SIZE else NO_CHECKSUM
+
+    def build(self, previous: "ShareIndex | None" = None) -> "ShareIndex":
+        """Return the index, reusing the parts of the previous one whose columns did not change."""
+        return ShareIndex(self, previous)
+
+
+class ShareIndex:
+    """Read-only index of the shares, about 100 bytes per share plus its name.
+
+    Shares are stored column-wise: ids, sizes and priorities in arrays,
+    the names and the MD5 checksums each in one bytes object, and every
+    directory once. Sorted key
+    arrays answer lookups by checksum and path and directory prefix
+    queries with bisect, a permutation by size the largest files.
+
+    A new index reuses the directory strings of the previous one and every
+    sort order whose column is unchanged, so e.g. a change of priorities
+    only replaces the priority column.
+    """
+
+    __slots__ = ("ids", "directories", "directory_of", "names", "name_ends", "sizes", "priorities", "checksums", "total_size",
+                 "_path_keys", "_path_order", "_checksum_keys", "_checksum_order", "_size_order",
+                 "_sorted_directories", "_directory_order", "_directory_starts")
+
+    def __init__(self, builder: ShareIndexBuilder | None = None, previous: "ShareIndex | None" = None):
+        """Init."""
+        builder = builder or ShareIndexBuilder()
+
+        known = {directory: directory for directory in previous.directories} if previous is not None else {}
+        directories = tuple(known.get(directory, directory) for directory in builder.directories)
+        names = bytes(builder.names)
+        if previous is not None and previous.names == names:
+            names = previous.names
+
+        self.ids = builder.ids
+        self.directories = directories
+        self.directory_of = builder.directory_of
+        self.names = names
+        self.name_ends = builder.name_ends
+        self.sizes = builder.sizes
+        self.priorities = builder.priorities
+        self.checksums = bytes(builder.checksums)
+        self.total_size = sum(self.sizes)
+
+        if previous is not None and previous.names is names and previous.name_ends == self.name_ends \
+                and previous.directory_of == self.directory_of and previous.directories == directories:
+            self._path_keys, self._path_order = previous._path_keys, previous._path_order
+            self._sorted_directories = previous._sorted_directories
+            self._directory_order, self._directory_starts = previous._directory_order, previous._directory_starts
+        else:
+            self._path_order = _order(builder.path_hashes)
+            self._path_keys = _sorted_keys(builder.path_hashes, self._path_order)
+            self._index_directories()
+
+        if previous is not None and previous.checksums == self.checksums:
+            self._checksum_keys, self._checksum_order = previous._checksum_keys, previous._checksum_order
+        else:
+            prefixes = array("Q", (int.from_bytes(self.checksums[offset:offset + 8], "big")
+                                   for offset in range(0, len(self.checksums), CHECKSUM_SIZE)))
+            self._checksum_order = _order(prefixes)
+            self._checksum_keys = _sorted_keys(prefixes, self._checksum_order)
+
+        if previous is not None and previous.sizes == self.sizes:
+            self._size_order = previous._size_order
+        else:
+            self._size_order = _order(self.sizes, reverse=True)
+
+    def _index_directories(self) -> None:
+        """Group the shares by directory, the directories sorted by name."""
+        ranks = {directory: rank for rank, directory in enumerate(sorted(self.directories))}
+        directory_rank = array("l", (ranks[directory] for directory in self.directories))
+        rank_of = array("l", map(directory_rank.__getitem__, self.directory_of))
+        self._directory_order = _order(rank_of)
+
+        counts = Counter(rank_of)
+        starts = array("l", [0])
+        for rank in range(len(ranks)):
+            starts.append(starts[-1] + counts[rank])
+        self._sorted_directories = sorted(self.directories)
+        self._directory_starts = starts
+
+    def __len__(self) -> int:
+        """Return the number of shares."""
+        return len(self.ids)
+
+    def filename(self, position: int) -> str:
+        """Return the full path of a share."""
+        start = self.name_ends[position - 1] if position else 0
+        name = self.names[start:self.name_ends[position]].decode("utf-8", "surrogatepass")
+        return self.directories[self.directory_of[position]] + name
+
+    def checksum(self, position: int) -> str:
+        """Return the checksum of a share as hex string."""
+        return self.checksums[position * CHECKSUM_SIZE:(position + 1) * CHECKSUM_SIZE].hex()
+
+    def entry(self, position: int) -> dict:
+        """Return a share as dict."""
+        return {
+            "id": self.ids[position],
+            "filename": self.filename(position),
+            "checksum": self.checksum(position),
+            "size": self.sizes[position],
+            "priority": self.priorities[position],
+        }
+
+    def find_checksum(self, checksum: str) -> list:
+        """Return the positions of the shares with this checksum."""
+        try:
+            raw = bytes.fromhex(checksum)
+        except ValueError:
+            return []
+        if len(raw) != CHECKSUM_SIZE or raw == NO_CHECKSUM:
+            return []
+
+        key = int.from_bytes(raw[:8], "big")
+        found = []
+        index = bisect_left(self._checksum_keys, key)
+        while index < len(self._checksum_keys) and self._checksum_keys[index] == key:
+            position = self._checksum_order[index]
+            if self.checksums[position * CHECKSUM_SIZE:(position + 1) * CHECKSUM_SIZE] == raw:
+                found.append(position)
+            index += 1
+        return found
+
+    def find_path(self, filename: str) -> list:
+        """Return the positions of the shares with this full path."""
+        key = hash(filename)
+        found = []
+        index = bisect_left(self._path_keys, key)
+        while index < len(self._path_keys) and self._path_keys[index] == key:
+            position = self._path_order[index]
+            if self.filename(position) == filename:
+                found.append(position)
+            index += 1
+        return found
+
+    def in_directory(self, directory: str, recursive: bool = True):
+        """Yield the positions of the shares in a directory, and its subdirectories if recursive."""
+        directory = directory.rstrip("/\\")
+        directories = self._sorted_directories
+        ranks = []
+        for separator in SEPARATORS:
+            prefix = directory + separator
+            first = bisect_left(directories, prefix)
+            if recursive:
+                # the directory and its subdirectories sort before directory + the next character
+                ranks.append(range(first, bisect_left(directories, directory + chr(ord(separator) + 1))))
+            elif first < len(directories) and directories[first] == prefix:
+                ranks.append(range(first, first + 1))
+
+        starts = self._directory_starts
+        for rank in chain.from_iterable(ranks):
+            yield from self._directory_order[starts[rank]:starts[rank + 1]]
+
+    def largest(self):
+        """Yield the positions of the shares, largest first."""
+        return iter(self._size_order)
+
+    def by_priority(self) -> dict:
+        """Return the number of shares per priority."""
+        return dict(Counter(self.priorities))
+
+
+EMPTY_SHARE_INDEX = ShareIndex()
@@ -0,0 +1,89 @@
+"""Persisted last known snapshot of an appleJuice Core."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION, STORAGE_SAVE_DELAY
+from .model import Aggregate, InformationRecord, NetworkInfoRecord, ServerRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# stored aggregates: snapshot attribute, aggregate key of the state
+STORED_AGGREGATES = {
+    "download_stats": "download",
+    "upload_stats": "upload",
+    "share_stats": "shares",
+}
+
+
+class SnapshotStore:
+    """Keeps a compact copy of the last snapshot in the Home Assistant storage.
+
+    Only what the core and network entities show is stored: version and
+    system, information, networkinfo, the connected server and the
+    aggregates of downloads, uploads and shares. Writes are delayed by
+    STORAGE_SAVE_DELAY seconds and take the data at write time, so a core
+    polled every few seconds is written at most once per delay.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Init."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._pending = False
+        self._data_func = None
+        self._closed = False
+
+    async def async_load(self) -> dict | None:
+        """Return the stored snapshot, None if there is none."""
+        return await self._store.async_load()
+
+    @callback
+    def async_schedule_save(self, data_func) -> None:
+        """Save the result of data_func after the delay, unless a save is pending already."""
+        if self._pending or self._closed:
+            return
+        self._pending = True
+        self._data_func = data_func
+
+        def _data() -> dict:
+            self._pending = False
+            return data_func()
+
+        self._store.async_delay_save(_data, STORAGE_SAVE_DELAY)
+
+    async def async_close(self) -> None:
+        """Write a pending save now and save nothing later, before the entry is unloaded or removed."""
+        self._closed = True
+        if self._pending:
+            self._pending = False
+            await self._store.async_save(self._data_func())
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
+
+
+def snapshot_to_dict(version, system, snapshot) -> dict:
+    """Return the stored form of a snapshot."""
+    server = snapshot.servers.get(snapshot.networkinfo.connectedwithserverid)
+    return {
+        "version": version,
+        "system": system,
+        "information": snapshot.information.as_dict(),
+        "networkinfo": snapshot.networkinfo.as_dict(),
+        "server": server.as_dict() if server is not None else None,
+        **{name: getattr(snapshot, name).as_dict() for name in STORED_AGGREGATES},
+    }
+
+
+def restore_state(state, data: dict) -> None:
+    """Restore the state from the stored form of a snapshot."""
+    server = ServerRecord.from_dict(data["server"]) if data.get("server") else None
+    state.restore(
+        InformationRecord.from_dict(data.get("information", {})),
+        NetworkInfoRecord.from_dict(data.get("networkinfo", {})),
+        {server.id: server} if server is not None else {},
+        {key: Aggregate.from_dict(data.get(name, {})) for name, key in STORED_AGGREGATES.items()},
+    )
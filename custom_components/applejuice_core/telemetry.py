@@ -0,0 +1,124 @@
+"""Performance telemetry of an appleJuice Core coordinator."""
+
+import logging
+from array import array
+
+from .const import TELEMETRY_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RollingWindow:
+    """Fixed-size, array-backed window over the last samples."""
+
+    __slots__ = ("_values", "_next", "count")
+
+    def __init__(self, size: int = TELEMETRY_WINDOW):
+        """Init."""
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return min(self.count, len(self._values))
+
+    def add(self, value: float) -> None:
+        """Add a sample, replacing the oldest one once the window is full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self.count += 1
+
+    @property
+    def last(self) -> float | None:
+        """Return the latest sample."""
+        if not self.count:
+            return None
+        return self._values[self._next - 1]
+
+    def values(self) -> list:
+        """Return the samples in the window, oldest first."""
+        if self.count < len(self._values):
+            return self._values[:self.count].tolist()
+        return (self._values[self._next:] + self._values[:self._next]).tolist()
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank percentile of the window."""
+        if not self.count:
+            return None
+        values = sorted(self.values())
+        return values[min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))]
+
+    def as_dict(self, digits: int = 4) -> dict:
+        """Return last value and percentiles for diagnostics."""
+        if not self.count:
+            return {"count": 0}
+        values = sorted(self.values())
+        return {
+            "count": self.count,
+            "last": round(self.last, digits),
+            "p50": round(self.percentile(50), digits),
+            "p95": round(self.percentile(95), digits),
+            "max": round(values[-1], digits),
+        }
+
+
+class EndpointTelemetry:
+    """Request latency, response size and parse time of one endpoint."""
+
+    def __init__(self):
+        """Init."""
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = RollingWindow()
+        self.size = RollingWindow()
+        self.parse_time = RollingWindow()
+
+    def record(self, success: bool, latency: float, parser) -> None:
+        """Record one request."""
+        self.requests += 1
+        if not success:
+            self.errors += 1
+            return
+        self.bytes += parser.size
+        self.latency.add(latency)
+        self.size.add(parser.size)
+        self.parse_time.add(parser.busy)
+
+    def as_dict(self) -> dict:
+        """Return the endpoint telemetry for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "latency": self.latency.as_dict(),
+            "size": self.size.as_dict(0),
+            "parse_time": self.parse_time.as_dict(),
+        }
+
+
+class Telemetry:
+    """Rolling performance figures of one coordinator."""
+
+    def __init__(self):
+        """Init."""
+        self.endpoints = {}
+        self.update_duration = RollingWindow()
+        self.loop_busy = RollingWindow()
+        self.entities_written = RollingWindow()
+
+    def endpoint(self, endpoint: str) -> EndpointTelemetry:
+        """Return the telemetry of an endpoint."""
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointTelemetry()
+        return self.endpoints[endpoint]
+
+    def as_dict(self) -> dict:
+        """Return the telemetry for diagnostics."""
+        return {
+            "update_duration": self.update_duration.as_dict(),
+            "loop_busy": self.loop_busy.as_dict(),
+            "entities_written": self.entities_written.as_dict(0),
+            "endpoints": {endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()},
+        }
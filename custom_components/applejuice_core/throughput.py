@@ -0,0 +1,132 @@
+"""Rolling throughput series of an appleJuice Core."""
+
+import logging
+from array import array
+from bisect import bisect_left, insort
+
+from .const import THROUGHPUT_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ThroughputSeries:
+    """Fixed-size, array-backed series of one session byte counter and its reported speed.
+
+    Each sample stores the counter delta, the seconds since the previous
+    sample and the speed the core reported. The window sums are updated
+    when a sample enters or leaves the ring buffer, and the speeds are kept
+    sorted with bisect, so neither the averages nor the percentiles scan
+    the window. A counter that went backwards, e.g. after a restart of the
+    core, starts a new series without a rate for that sample.
+    """
+
+    __slots__ = ("_deltas", "_seconds", "_speeds", "_sorted", "_next", "count", "rate",
+                 "_time", "_counter", "_window_bytes", "_window_seconds", "_window_speed")
+
+    def __init__(self, size: int = THROUGHPUT_WINDOW):
+        """Init."""
+        self._deltas = array("q", bytes(8 * size))
+        self._seconds = array("d", bytes(8 * size))
+        self._speeds = array("q", bytes(8 * size))
+        self._sorted = []
+        self._next = 0
+        self.count = 0
+        self.rate = None
+        self._time = None
+        self._counter = None
+        self._window_bytes = 0
+        self._window_seconds = 0.0
+        self._window_speed = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._sorted)
+
+    def add(self, time: float, counter: int, speed: int) -> None:
+        """Add a sample, replacing the oldest one once the window is full."""
+        delta, seconds = 0, 0.0
+        if self._counter is not None and counter >= self._counter and time > self._time:
+            delta, seconds = counter - self._counter, time - self._time
+            self.rate = delta / seconds
+        else:
+            self.rate = None
+        self._time, self._counter = time, counter
+
+        slot = self._next
+        if len(self._sorted) == len(self._speeds):
+            self._window_bytes -= self._deltas[slot]
+            self._window_seconds -= self._seconds[slot]
+            self._window_speed -= self._speeds[slot]
+            del self._sorted[bisect_left(self._sorted, self._speeds[slot])]
+
+        self._deltas[slot] = delta
+        self._seconds[slot] = seconds
+        self._speeds[slot] = speed
+        self._window_bytes += delta
+        self._window_seconds += seconds
+        self._window_speed += speed
+        insort(self._sorted, speed)
+
+        self._next = (slot + 1) % len(self._speeds)
+        self.count += 1
+
+    @property
+    def rate_average(self) -> float | None:
+        """Return the bytes per second of the counter over the window."""
+        if self._window_seconds <= 0:
+            return None
+        return self._window_bytes / self._window_seconds
+
+    @property
+    def speed_average(self) -> float | None:
+        """Return the mean reported speed of the window."""
+        if not self._sorted:
+            return None
+        return self._window_speed / len(self._sorted)
+
+    def percentile(self, percent: float) -> int | None:
+        """Return the nearest-rank percentile of the reported speeds in the window."""
+        if not self._sorted:
+            return None
+        return self._sorted[min(len(self._sorted) - 1, max(0, round(percent / 100 * len(self._sorted)) - 1))]
+
+    def values(self) -> tuple:
+        """Return what the sensors show, to detect a change of the series."""
+        return self.rate, self.rate_average, self.speed_average, self.percentile(50), self.percentile(95)
+
+    def as_dict(self) -> dict:
+        """Return the series for diagnostics."""
+        return {
+            "count": self.count,
+            "rate": self.rate,
+            "rate_average": self.rate_average,
+            "speed_average": self.speed_average,
+            "speed_p50": self.percentile(50),
+            "speed_p95": self.percentile(95),
+        }
+
+
+class Throughput:
+    """Upload and download series of one core, fed from <information>."""
+
+    def __init__(self):
+        """Init."""
+        self.upload = ThroughputSeries()
+        self.download = ThroughputSeries()
+
+    def add(self, time: float, information) -> frozenset:
+        """Add the counters and speeds of one poll, return the changes as (throughput, direction)."""
+        changes = set()
+        for direction, series, counter, speed in (
+                ("upload", self.upload, information.sessionupload, information.uploadspeed),
+                ("download", self.download, information.sessiondownload, information.downloadspeed),
+        ):
+            before = series.values()
+            series.add(time, counter, speed)
+            if series.values() != before:
+                changes.add(("throughput", direction))
+        return frozenset(changes)
+
+    def as_dict(self) -> dict:
+        """Return the series for diagnostics."""
+        return {"upload": self.upload.as_dict(), "download": self.download.as_dict()}
@@ -0,0 +1 @@
+"""Tests of the appleJuice Core integration."""
@@ -0,0 +1,76 @@
+"""Helpers of the appleJuice Core tests."""
+
+import asyncio
+import hashlib
+import tempfile
+
+from homeassistant.config_entries import ConfigEntry, current_entry
+from homeassistant.core import HomeAssistant
+
+from custom_components.applejuice_core import AppleJuiceCoordinator
+from custom_components.applejuice_core.api import AppleJuiceClient
+from custom_components.applejuice_core.const import DOMAIN
+from custom_components.applejuice_core.parser import StreamParser
+
+DATA = {"url": "127.0.0.1", "port": 9851, "password": "secret", "tls": False}
+
+
+class FakeResponse:
+    """Response with the headers the response cache reads."""
+
+    def __init__(self, etag: str | None = None):
+        """Init."""
+        self.headers = {"ETag": etag} if etag is not None else {}
+
+
+def parse(handler, body: str):
+    """Feed an XML document to a parser handler and return the handler."""
+    parser = StreamParser(handler)
+    parser.feed(body.encode())
+    parser.close()
+    return handler
+
+
+def modified_xml(*elements: str, time: int = 1) -> str:
+    """Return a modified.xml document with the elements."""
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<applejuice><time>{time}</time>{"".join(elements)}</applejuice>'
+
+
+def download_xml(download_id: str, ready: int = 0, status: int = 0) -> str:
+    """Return a <download> element of a 1000 byte file."""
+    return (f'<download id="{download_id}" shareid="0" hash="{download_id * 32}" filename="file{download_id}.iso" '
+            f'size="1000" ready="{ready}" status="{status}" powerdownload="0"/>')
+
+
+def serve(bodies: dict):
+    """Return a stream_xml_data replacement answering every endpoint with a fixed body."""
+
+    async def stream_xml_data(endpoint, parser, params=None, cache=None, timeout=None, executor_threshold=None):
+        body = bodies[endpoint]
+        parser.feed(body)
+        parser.close()
+        if cache is not None:
+            cache.update(FakeResponse(), hashlib.blake2b(body, digest_size=16).hexdigest())
+        return True
+
+    return stream_xml_data
+
+
+def run_with_coordinator(test, options: dict | None = None) -> None:
+    """Run a test coroutine with the coordinator of a config entry, without a core."""
+
+    async def _async_run() -> None:
+        hass = HomeAssistant(tempfile.mkdtemp())
+        entry = ConfigEntry(version=1, minor_version=1, domain=DOMAIN, title="core", data=DATA, source="user",
+                            options=options or {})
+        current_entry.set(entry)
+        coordinator = AppleJuiceCoordinator(hass, entry, AppleJuiceClient.from_config(hass, DATA))
+        try:
+            await test(coordinator)
+        finally:
+            coordinator.section_refresher.async_cancel()
+            coordinator._async_unsub_refresh()
+            await coordinator.client.close()
+            await hass.async_stop(force=True)
+
+    asyncio.run(_async_run())
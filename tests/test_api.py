@@ -0,0 +1,23 @@
+"""Tests of the appleJuice Core client."""
+
+from custom_components.applejuice_core.api import ResponseCache
+
+from .common import FakeResponse
+
+
+def test_response_cache_commits_applied_responses_only():
+    """Validators and digest of a response count once the caller committed them."""
+    cache = ResponseCache()
+
+    cache.update(FakeResponse("v1"), "digest")
+    assert cache.changed
+    assert cache.request_headers() == {}
+
+    cache.update(FakeResponse("v1"), "digest")
+    assert cache.changed
+
+    cache.commit()
+    assert cache.request_headers() == {"If-None-Match": "v1"}
+    cache.update(FakeResponse("v1"), "digest")
+    assert not cache.changed
+    assert (cache.hits, cache.misses) == (1, 2)
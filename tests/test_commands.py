@@ -0,0 +1,66 @@
+"""Tests of the coalesced download commands."""
+
+import asyncio
+
+from .common import run_with_coordinator
+
+
+def _record_calls(coordinator, delay: float = 0.0, failing=()):
+    calls = []
+    refreshes = []
+
+    async def call_function(method, params):
+        calls.append((method, params))
+        await asyncio.sleep(delay)
+        return params["id"] not in failing
+
+    async def async_request_sections(sections):
+        refreshes.append(sections)
+
+    coordinator.client.call_function = call_function
+    coordinator.async_request_sections = async_request_sections
+    return calls, refreshes
+
+
+def test_last_command_of_a_group_wins():
+    """Commands of one group for the same download replace each other before they are sent."""
+
+    async def test(coordinator):
+        calls, refreshes = _record_calls(coordinator)
+        commands = coordinator.commands
+
+        results = await asyncio.gather(
+            commands.async_send("pausedownload", [1, 2]),
+            commands.async_send("resumedownload", [1]),
+            commands.async_send("setpowerdownload", [1], {"powerdownload": 12}),
+        )
+
+        assert results == [[], [], []]
+        assert sorted(calls) == [
+            ("pausedownload", {"id": "2"}),
+            ("resumedownload", {"id": "1"}),
+            ("setpowerdownload", {"id": "1", "powerdownload": 12}),
+        ]
+        assert commands.coalesced == 1
+        assert refreshes == [frozenset({"download"})]
+
+    run_with_coordinator(test)
+
+
+def test_identical_command_in_flight_is_not_sent_again():
+    """A command equal to one being sent waits for its result."""
+
+    async def test(coordinator):
+        calls, _ = _record_calls(coordinator, delay=0.2, failing={"3"})
+        commands = coordinator.commands
+
+        first = asyncio.ensure_future(commands.async_send("canceldownload", [3]))
+        while not commands._in_flight:
+            await asyncio.sleep(0.01)
+
+        assert await commands.async_send("canceldownload", [3]) == ["3"]
+        assert await first == ["3"]
+        assert calls == [("canceldownload", {"id": "3"})]
+        assert commands.as_dict() == {"sent": 1, "coalesced": 1, "failed": 1, "queued": 0, "in_flight": 0}
+
+    run_with_coordinator(test)
@@ -0,0 +1,13 @@
+"""Tests of the appleJuice Core config flow."""
+
+import typing
+
+import pytest
+
+from custom_components.applejuice_core.config_flow import OptionsFlowHandler
+
+
+@pytest.mark.parametrize("step", ["async_step_init", "async_step_write_limits"])
+def test_option_steps_are_annotated_with_known_names(step):
+    """The annotations of the option steps resolve."""
+    assert "user_input" in typing.get_type_hints(getattr(OptionsFlowHandler, step))
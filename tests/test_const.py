@@ -0,0 +1,8 @@
+"""Tests of the appleJuice Core constants."""
+
+from custom_components.applejuice_core.const import ENDPOINT_TIMEOUTS, POLL_TIMEOUT
+
+
+def test_endpoint_timeouts_end_before_the_poll_budget():
+    """The poll budget never cancels an endpoint before its own timeout."""
+    assert all(timeout < POLL_TIMEOUT for timeout in ENDPOINT_TIMEOUTS.values())
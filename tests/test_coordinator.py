@@ -0,0 +1,143 @@
+"""Tests of the appleJuice Core coordinator."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from .common import run_with_coordinator, serve
+
+SHARE_XML = (b'<?xml version="1.0" encoding="UTF-8"?>\n<applejuice><shares>'
+             b'<share id="1" filename="/data/a.iso" checksum="00112233445566778899aabbccddeeff" size="100" priority="1"/>'
+             b'<share id="2" filename="/data/b.iso" checksum="ffeeddccbbaa99887766554433221100" size="200" priority="1"/>'
+             b'</shares></applejuice>')
+
+
+def test_refreshes_never_overlap():
+    """Scheduled, restored and requested refreshes poll one after another."""
+
+    async def test(coordinator):
+        running = 0
+        polls = []
+
+        async def _async_poll():
+            nonlocal running
+            running += 1
+            polls.append(running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return coordinator.state.snapshot()
+
+        coordinator._async_poll = _async_poll
+        # without the stagger of the fleet only the refresh lock keeps the polls apart
+        coordinator.fleet.stagger = 0
+
+        await asyncio.gather(
+            coordinator.async_refresh(),
+            coordinator.async_refresh(),
+            coordinator._async_refresh(log_failures=True, scheduled=True),
+        )
+
+        assert polls == [1, 1, 1]
+
+    run_with_coordinator(test)
+
+
+@pytest.mark.parametrize("failure", [asyncio.CancelledError, ValueError])
+def test_lost_share_list_is_fetched_again(failure):
+    """A share list that was not applied, e.g. by a cancelled poll, is applied with the next identical response."""
+
+    async def test(coordinator):
+        coordinator.client.stream_xml_data = serve({"/xml/share.xml": SHARE_XML})
+        share_lane = next(lane for lane in coordinator.lanes if lane.name == "shares")
+        apply_share = coordinator.state.apply_share
+
+        def fail(update):
+            raise failure
+
+        coordinator.state.apply_share = fail
+        with pytest.raises(failure):
+            await share_lane.updater(coordinator, share_lane)
+
+        coordinator.state.apply_share = apply_share
+        assert await share_lane.updater(coordinator, share_lane)
+        assert "shares" in coordinator.state.loaded
+        assert len(coordinator.state.shares) == 2
+
+    run_with_coordinator(test)
+
+
+def test_failed_first_poll_saves_nothing():
+    """A poll of an unreachable core schedules no save of the snapshot it does not have."""
+
+    async def test(coordinator):
+        async def stream_xml_data(endpoint, parser, **kwargs):
+            return False
+
+        coordinator.client.stream_xml_data = stream_xml_data
+        await coordinator.async_refresh()
+
+        assert not coordinator.last_update_success
+        assert coordinator.data is None
+        assert coordinator._stored_snapshot() is None
+        assert not coordinator.store._pending
+
+    run_with_coordinator(test)
+
+
+def test_removed_entry_leaves_no_pending_save():
+    """Closing the store writes the pending save now, so the removal of the file is final."""
+
+    async def test(coordinator):
+        coordinator.store.async_schedule_save(lambda: {"version": 1})
+        await coordinator.store.async_close()
+        coordinator.store.async_schedule_save(lambda: {"version": 2})
+
+        assert coordinator.store._store._delay_handle is None
+        assert coordinator.store._store._unsub_final_write_listener is None
+        await coordinator.store.async_remove()
+        assert await coordinator.store._store.async_load() is None
+
+    run_with_coordinator(test)
+
+
+def test_poll_without_requests_keeps_a_failed_core_unavailable():
+    """A poll that sends no request does not report success after a failed one."""
+
+    async def test(coordinator):
+        async def stream_xml_data(endpoint, parser, **kwargs):
+            return False
+
+        coordinator.client.stream_xml_data = stream_xml_data
+        coordinator.subscriptions_complete = True
+        unsubscribe = coordinator.async_subscribe([("information",)])
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+
+        # e.g. all entities of the polled lanes were disabled meanwhile
+        unsubscribe()
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+
+    run_with_coordinator(test)
+
+
+def test_executor_threshold_is_kept_per_lane_and_grows_back():
+    """A slow parse lowers the threshold of its lane only, fast parses raise it back to the configured one."""
+
+    async def test(coordinator):
+        live, transfers = coordinator.lanes[:2]
+        configured = coordinator.executor_threshold
+
+        slow = SimpleNamespace(size=configured * 2, busy=0.2, loop_busy=0.2, offloaded=False)
+        coordinator._account_request(transfers, "/xml/modified.xml", slow, True, 0.3)
+        assert coordinator.executor_thresholds[transfers.name] == configured // 2
+        assert coordinator.executor_thresholds[live.name] == configured
+
+        fast = SimpleNamespace(size=configured, busy=0.001, loop_busy=0.001, offloaded=False)
+        coordinator._account_request(transfers, "/xml/modified.xml", fast, True, 0.01)
+        assert coordinator.executor_thresholds[transfers.name] == configured
+        coordinator._account_request(transfers, "/xml/modified.xml", fast, True, 0.01)
+        assert coordinator.executor_thresholds[transfers.name] == configured
+
+    run_with_coordinator(test)
@@ -0,0 +1,30 @@
+"""Tests of the write filter of high-churn sensors."""
+
+from custom_components.applejuice_core.deadband import WriteFilter, write_limit_option
+
+
+def test_write_limits_are_off_by_default():
+    """Without options no sensor gets a write filter."""
+    assert WriteFilter.from_options("openconnections", {}) is None
+
+
+def test_change_of_the_deadband_is_written():
+    """A change of exactly the deadband is written, a smaller one waits for the maximum interval."""
+    write_filter = WriteFilter.from_options("openconnections", {
+        write_limit_option("openconnections", "deadband"): 1,
+        write_limit_option("openconnections", "write_interval_max"): 300,
+    })
+    write_filter.written(10, 0.0)
+
+    assert write_filter.delay(11, 5.0) == 0
+    assert write_filter.delay(10.5, 5.0) == 295.0
+    assert write_filter.delay(10, 5.0) is None
+
+
+def test_minimum_interval_holds_back_changes():
+    """A change beyond the deadband waits for the minimum interval."""
+    write_filter = WriteFilter(absolute=0.1, interval_min=10)
+    write_filter.written(1.0, 0.0)
+
+    assert write_filter.delay(2.0, 4.0) == 6.0
+    assert write_filter.delay(2.0, 10.0) == 0
@@ -0,0 +1,99 @@
+"""Tests of the download and connection events."""
+
+from custom_components.applejuice_core.const import (
+    DOWNLOAD_STATUS_ACTIVE,
+    DOWNLOAD_STATUS_CANCELLED,
+    DOWNLOAD_STATUS_CANCELLING,
+    DOWNLOAD_STATUS_PAUSED,
+    DOWNLOAD_STATUS_READY,
+)
+from custom_components.applejuice_core.events import (
+    EVENT_DOWNLOAD_CANCELLED,
+    EVENT_DOWNLOAD_FINISHED,
+    EVENT_DOWNLOAD_PAUSED,
+    EVENT_DOWNLOAD_REMOVED,
+    EVENT_DOWNLOAD_RESUMED,
+    EVENT_FIREWALLED_CHANGED,
+    EVENT_SERVER_SWITCHED,
+    download_events,
+    network_events,
+)
+from custom_components.applejuice_core.model import AppleJuiceState, DeltaCursor, ModifiedUpdate
+
+from .common import download_xml, modified_xml, parse
+
+
+def _snapshots(before: str, after: str):
+    state = AppleJuiceState()
+    cursor = DeltaCursor()
+    state.apply_modified(parse(ModifiedUpdate(True), before), cursor)
+    previous = state.snapshot()
+    state.take_changed_downloads()
+    state.apply_modified(parse(ModifiedUpdate(False), after), cursor)
+    return previous, state.snapshot(), state.take_changed_downloads()
+
+
+def test_download_transitions():
+    """Status changes and removals become events, other changes do not."""
+    previous, current, changed = _snapshots(
+        modified_xml(
+            download_xml("1", status=DOWNLOAD_STATUS_ACTIVE),
+            download_xml("2", status=DOWNLOAD_STATUS_ACTIVE),
+            download_xml("3", status=DOWNLOAD_STATUS_PAUSED),
+            download_xml("4", status=DOWNLOAD_STATUS_ACTIVE),
+            download_xml("5", status=DOWNLOAD_STATUS_CANCELLING),
+            download_xml("6", status=DOWNLOAD_STATUS_ACTIVE),
+            download_xml("7", status=DOWNLOAD_STATUS_ACTIVE),
+        ),
+        modified_xml(
+            download_xml("1", ready=1000, status=DOWNLOAD_STATUS_READY),
+            download_xml("2", status=DOWNLOAD_STATUS_PAUSED),
+            download_xml("3", status=DOWNLOAD_STATUS_ACTIVE),
+            download_xml("4", status=DOWNLOAD_STATUS_CANCELLING),
+            download_xml("5", status=DOWNLOAD_STATUS_CANCELLED),
+            download_xml("6", ready=10, status=DOWNLOAD_STATUS_ACTIVE),
+            download_xml("8", status=DOWNLOAD_STATUS_ACTIVE),
+            '<removed><object id="7"/></removed>',
+            time=2,
+        ),
+    )
+
+    events = sorted((data["download_id"], event_type) for event_type, data in download_events(previous, current,
+                                                                                               changed))
+    assert events == [
+        ("1", EVENT_DOWNLOAD_FINISHED),
+        ("2", EVENT_DOWNLOAD_PAUSED),
+        ("3", EVENT_DOWNLOAD_RESUMED),
+        ("4", EVENT_DOWNLOAD_CANCELLED),
+        ("7", EVENT_DOWNLOAD_REMOVED),
+    ]
+    assert sorted(download_events(previous, current, None)) == sorted(download_events(previous, current, changed))
+
+
+def test_only_the_changed_downloads_are_compared():
+    """Downloads outside the changed ids are not diffed."""
+    previous, current, _ = _snapshots(
+        modified_xml(download_xml("1", status=DOWNLOAD_STATUS_ACTIVE)),
+        modified_xml(download_xml("1", status=DOWNLOAD_STATUS_READY), time=2),
+    )
+
+    assert list(download_events(previous, current, set())) == []
+    assert [event_type for event_type, _ in download_events(previous, current, {"1"})] == [EVENT_DOWNLOAD_FINISHED]
+
+
+def test_network_transitions():
+    """A server switch reports both servers, a firewall change its new state."""
+    previous, current, _ = _snapshots(
+        modified_xml('<networkinfo connectedwithserverid="1" firewalled="false"/>',
+                     '<server id="1" name="one" host="a" port="1"/>', '<server id="2" name="two" host="b" port="2"/>'),
+        modified_xml('<networkinfo connectedwithserverid="2" firewalled="true"/>', time=2),
+    )
+
+    assert list(network_events(previous, current)) == [
+        (EVENT_SERVER_SWITCHED, {
+            "previous": {"id": "1", "name": "one", "host": "a", "port": 1},
+            "server": {"id": "2", "name": "two", "host": "b", "port": 2},
+        }),
+        (EVENT_FIREWALLED_CHANGED, {"firewalled": True}),
+    ]
+    assert list(network_events(current, current)) == []
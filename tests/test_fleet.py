@@ -0,0 +1,34 @@
+"""Tests of the fleet scheduler."""
+
+import asyncio
+
+from custom_components.applejuice_core.fleet import FleetScheduler
+
+
+def test_poll_starts_fit_into_the_shortest_interval():
+    """Many cores on a short interval are spaced closer than the stagger, so all of them poll in time."""
+
+    async def _async_run():
+        fleet = FleetScheduler(max_polls=4, stagger=0.25)
+        for core in range(20):
+            fleet.add(str(core), 0.4)
+        assert fleet.spacing == 0.02
+
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def _async_poll(core):
+            async with fleet.poll(core):
+                starts.append(loop.time())
+
+        await asyncio.gather(*(_async_poll(str(core)) for core in range(20)))
+        assert starts[-1] - starts[0] < 0.4
+
+        for core in range(18):
+            fleet.remove(str(core))
+        assert fleet.spacing == 0.2
+        fleet.remove("18")
+        fleet.remove("19")
+        assert fleet.spacing == 0.25
+
+    asyncio.run(_async_run())
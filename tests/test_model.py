@@ -0,0 +1,143 @@
+"""Tests of the appleJuice Core state model."""
+
+from custom_components.applejuice_core import _is_affected
+from custom_components.applejuice_core.model import (
+    AppleJuiceState,
+    DeltaCursor,
+    ModifiedUpdate,
+    diff_snapshots,
+    modified_filter,
+)
+
+from .common import download_xml, modified_xml, parse
+
+
+def _apply(state: AppleJuiceState, cursor: DeltaCursor, body: str, full: bool = False) -> bool:
+    return state.apply_modified(parse(ModifiedUpdate(full), body), cursor)
+
+
+def test_changed_downloads_notify_their_sensors_only():
+    """A delta reports the changed download ids, so sensors of other downloads are not updated."""
+    state = AppleJuiceState()
+    cursor = DeltaCursor()
+    _apply(state, cursor, modified_xml(download_xml("1"), download_xml("2")), full=True)
+    previous = state.snapshot()
+    state.take_changed_downloads()
+
+    _apply(state, cursor, modified_xml(download_xml("1"), download_xml("2", ready=500), time=2))
+    changes = diff_snapshots(previous, state.snapshot(), state.take_changed_downloads())
+
+    assert changes == {("download", "2")}
+    changed_sections = {change[0] for change in changes}
+    assert _is_affected({("download", "2")}, changes, changed_sections)
+    assert not _is_affected({("download", "1")}, changes, changed_sections)
+    assert _is_affected({("download",)}, changes, changed_sections)
+
+
+def test_full_resync_notifies_every_download_sensor():
+    """After a full response the changed ids are unknown and the whole section is reported."""
+    state = AppleJuiceState()
+    cursor = DeltaCursor()
+    _apply(state, cursor, modified_xml(download_xml("1")), full=True)
+    previous = state.snapshot()
+    state.take_changed_downloads()
+
+    _apply(state, cursor, modified_xml(download_xml("1", ready=10), time=2), full=True)
+    changes = diff_snapshots(previous, state.snapshot(), state.take_changed_downloads())
+
+    assert ("download",) in changes
+    assert _is_affected({("download", "1")}, changes, {change[0] for change in changes})
+
+
+def test_networkinfo_without_paused_is_paused():
+    """Like before the records, a networkinfo without the paused attribute reports a paused core."""
+    state = AppleJuiceState()
+    assert not state.networkinfo.paused
+
+    _apply(state, DeltaCursor(), modified_xml('<networkinfo users="1" firewalled="false"/>'), full=True)
+    assert state.networkinfo.paused
+    assert not state.networkinfo.firewalled
+
+    _apply(state, DeltaCursor(), modified_xml('<networkinfo paused="false"/>'), full=True)
+    assert not state.networkinfo.paused
+
+
+def test_delta_cursor_resyncs_when_the_filter_grows():
+    """A narrower filter keeps the delta position, a wider one or no filter starts a full resync."""
+    cursor = DeltaCursor()
+    assert not cursor.synced
+    assert cursor.params() == {"timestamp": 0}
+
+    cursor.use_filter(modified_filter({"download", "user"}))
+    cursor.session, cursor.timestamp = "42", 100
+    assert cursor.synced
+    assert cursor.params() == {"timestamp": 100, "session": "42", "filter": "down;user"}
+    assert cursor.covers("download")
+    assert not cursor.covers("server")
+
+    cursor.use_filter(modified_filter({"download"}))
+    assert cursor.synced
+
+    cursor.use_filter(modified_filter({"download", "server"}))
+    assert not cursor.synced
+    assert cursor.params() == {"timestamp": 0, "filter": "down;server"}
+
+    cursor.timestamp = 200
+    cursor.use_filter(modified_filter({"information", "networkinfo", "download", "user", "upload", "server"}))
+    assert cursor.filter is None
+    assert not cursor.synced
+
+
+def test_apply_modified_full_delta_and_removed():
+    """A full response replaces, a delta updates and removes single objects in place."""
+    state = AppleJuiceState()
+    cursor = DeltaCursor()
+    assert _apply(state, cursor, modified_xml(download_xml("1"), download_xml("2"), download_xml("3"),
+                                              '<information credits="5"/>', time=10), full=True)
+    assert cursor.timestamp == 10
+    assert set(state.objects["download"]) == {"1", "2", "3"}
+    assert {"download", "information"} <= state.loaded
+    assert state.information.credits == 5
+    assert state.take_changed_downloads() is None
+
+    before = state.snapshot()
+    assert _apply(state, cursor, modified_xml(download_xml("2", ready=100), '<removed><object id="3"/></removed>',
+                                              time=11))
+    after = state.snapshot()
+    assert cursor.timestamp == 11
+    assert set(after.downloads) == {"1", "2"}
+    assert after.downloads["2"].ready == 100
+    assert after.downloads["1"] is before.downloads["1"]
+    assert after.information is before.information
+    assert state.take_changed_downloads() == {"2", "3"}
+
+    # an unchanged delta keeps the snapshot
+    assert _apply(state, cursor, modified_xml(download_xml("2", ready=100), time=12))
+    assert state.snapshot() is after
+    assert state.take_changed_downloads() == set()
+
+
+def test_apply_modified_without_time_is_rejected():
+    """The core answers an invalid session without <time>, nothing of that response is applied."""
+    state = AppleJuiceState()
+    cursor = DeltaCursor()
+    _apply(state, cursor, modified_xml(download_xml("1"), time=10), full=True)
+
+    update = parse(ModifiedUpdate(False), '<?xml version="1.0"?>\n<applejuice>' + download_xml("2") + '</applejuice>')
+    assert not state.apply_modified(update, cursor)
+    assert set(state.objects["download"]) == {"1"}
+    assert cursor.timestamp == 10
+
+
+def test_full_response_replaces_only_the_filtered_sections():
+    """A full response of a filtered cursor leaves the sections of other lanes alone."""
+    state = AppleJuiceState()
+    _apply(state, DeltaCursor(), modified_xml(download_xml("1"), '<server id="7" name="a" host="h" port="1"/>'),
+           full=True)
+
+    cursor = DeltaCursor()
+    cursor.use_filter(modified_filter({"download"}))
+    _apply(state, cursor, modified_xml(download_xml("2"), time=2), full=True)
+
+    assert set(state.objects["download"]) == {"2"}
+    assert set(state.objects["server"]) == {"7"}
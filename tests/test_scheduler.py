@@ -0,0 +1,61 @@
+"""Tests of the polling scheduler."""
+
+from custom_components.applejuice_core.scheduler import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+)
+
+
+def test_breaker_opens_at_the_threshold():
+    """Single failures keep the breaker closed, the threshold opens it for the backoff."""
+    breaker = CircuitBreaker(threshold=2, backoff=10, maximum=40)
+
+    breaker.record_failure(0.0)
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow(0.0)
+
+    breaker.record_failure(1.0)
+    assert breaker.open
+    assert breaker.opened == 1
+    assert not breaker.allow(5.0)
+    assert breaker.retry_in(5.0) == 6.0
+
+    assert breaker.allow(11.0)
+    assert breaker.state == BREAKER_HALF_OPEN
+
+
+def test_failed_probes_back_off_up_to_the_maximum():
+    """Every failed probe opens the breaker again with a longer backoff."""
+    breaker = CircuitBreaker(threshold=1, backoff=10, maximum=25)
+    breaker.record_failure(0.0)
+
+    now = 0.0
+    backoffs = []
+    for _ in range(3):
+        now = breaker.retry_at
+        assert breaker.allow(now)
+        breaker.record_failure(now)
+        assert breaker.state == BREAKER_OPEN
+        backoffs.append(breaker.backoff)
+
+    assert backoffs == [20, 25, 25]
+    assert breaker.opened == 1
+    assert breaker.as_dict(now) == {"state": BREAKER_OPEN, "failures": 4, "backoff": 25, "retry_in": 25.0,
+                                    "opened": 1}
+
+
+def test_success_closes_and_resets_the_breaker():
+    """A successful probe closes the breaker with the initial backoff and no failures."""
+    breaker = CircuitBreaker(threshold=1, backoff=10, maximum=40)
+    breaker.record_failure(0.0)
+    breaker.allow(10.0)
+    breaker.record_failure(10.0)
+    breaker.allow(30.0)
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+    assert breaker.backoff == 10
+    assert breaker.as_dict(30.0)["retry_in"] is None
@@ -0,0 +1,84 @@
+"""Tests of the share index."""
+
+from custom_components.applejuice_core.model import ShareUpdate
+
+from .common import parse
+
+CHECKSUM_A = "00112233445566778899aabbccddeeff"
+CHECKSUM_B = "ffeeddccbbaa99887766554433221100"
+
+
+def _share_xml(*shares) -> str:
+    elements = "".join(
+        f'<share id="{share_id}" filename="{filename}" checksum="{checksum}" size="{size}" priority="{priority}"/>'
+        for share_id, filename, checksum, size, priority in shares
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<applejuice><shares>{elements}</shares></applejuice>'
+
+
+SHARES = (
+    (1, "/data/movies/a.iso", CHECKSUM_A, 300, 1),
+    (2, "/data/movies/old/b.iso", CHECKSUM_B, 100, 1),
+    (3, "/data/music/c.mp3", "invalid", 200, 5),
+    (4, "C:\\share\\d.iso", CHECKSUM_A, 50, 1),
+    (5, "/data/movies-hd/e.iso", CHECKSUM_B, 10, 1),
+)
+
+
+def _index(shares=SHARES, previous=None):
+    update = parse(ShareUpdate(), _share_xml(*shares))
+    assert update.complete
+    return update.build(previous)
+
+
+def test_index_answers_lookups():
+    """Shares are found by checksum, path, directory and size."""
+    index = _index()
+
+    assert len(index) == 5
+    assert index.total_size == 660
+    assert sorted(index.ids[position] for position in index.find_checksum(CHECKSUM_A)) == [1, 4]
+    assert index.find_checksum("invalid") == []
+    assert index.find_checksum("00" * 16) == []
+    assert [index.entry(position) for position in index.find_path("/data/music/c.mp3")] == [
+        {"id": 3, "filename": "/data/music/c.mp3", "checksum": "00" * 16, "size": 200, "priority": 5},
+    ]
+    assert index.find_path("/data/music/missing.mp3") == []
+    assert [index.ids[position] for position in index.largest()] == [1, 3, 2, 4, 5]
+    assert index.by_priority() == {1: 4, 5: 1}
+
+
+def test_directory_queries_do_not_match_siblings_with_the_same_prefix():
+    """/data/movies does not contain /data/movies-hd, subdirectories only if recursive."""
+    index = _index()
+
+    assert sorted(index.ids[p] for p in index.in_directory("/data/movies")) == [1, 2]
+    assert sorted(index.ids[p] for p in index.in_directory("/data/movies/", recursive=False)) == [1]
+    assert sorted(index.ids[p] for p in index.in_directory("/data")) == [1, 2, 3, 5]
+    assert sorted(index.ids[p] for p in index.in_directory("C:\\share")) == [4]
+    assert list(index.in_directory("/nothing")) == []
+
+
+def test_rebuilt_index_reuses_unchanged_columns():
+    """A change of the priorities only replaces the priorities, the sort orders are kept."""
+    previous = _index()
+    changed = tuple((*share[:4], 9) for share in SHARES)
+    index = _index(changed, previous)
+
+    assert index.by_priority() == {9: 5}
+    assert index.names is previous.names
+    assert index._size_order is previous._size_order
+    assert index._path_order is previous._path_order
+    assert index._checksum_order is previous._checksum_order
+    assert index.directories[0] is previous.directories[0]
+
+    resized = _index(tuple((*share[:3], 1000 - share[3], share[4]) for share in SHARES), index)
+    assert resized._size_order is not index._size_order
+    assert [resized.ids[position] for position in resized.largest()] == [5, 4, 2, 3, 1]
+
+
+def test_incomplete_share_list_is_not_complete():
+    """A share.xml cut off before </shares> is reported incomplete."""
+    update = ShareUpdate()
+    update("share", {"id": "1", "filename": "/a", "checksum": CHECKSUM_A, "size": "1", "priority": "1"}, "")
+    assert not update.complete
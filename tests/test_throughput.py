@@ -0,0 +1,51 @@
+"""Tests of the throughput series."""
+
+from custom_components.applejuice_core.model import InformationRecord
+from custom_components.applejuice_core.throughput import Throughput, ThroughputSeries
+
+
+def test_window_drops_the_oldest_samples():
+    """Once the ring buffer is full, the oldest sample leaves the sums and the percentiles."""
+    series = ThroughputSeries(size=3)
+    assert series.rate_average is None
+    assert series.percentile(50) is None
+
+    for second, (counter, speed) in enumerate([(0, 100), (1000, 900), (3000, 500), (6000, 300)]):
+        series.add(float(second), counter, speed)
+
+    assert len(series) == 3
+    assert series.count == 4
+    assert series.rate == 3000
+    assert series.rate_average == 2000
+    assert series.speed_average == (900 + 500 + 300) / 3
+    assert series.percentile(50) == 500
+    assert series.percentile(95) == 900
+    assert series.percentile(0) == 300
+
+
+def test_counter_reset_starts_a_new_series():
+    """A counter that went backwards, e.g. after a restart of the core, has no rate."""
+    series = ThroughputSeries(size=4)
+    series.add(0.0, 5000, 0)
+    series.add(1.0, 6000, 0)
+    series.add(2.0, 100, 0)
+    assert series.rate is None
+    series.add(4.0, 300, 0)
+    assert series.rate == 100
+    assert series.rate_average == (1000 + 200) / 3
+
+
+def test_throughput_reports_changed_directions():
+    """Only the directions whose sensor values changed are reported."""
+    throughput = Throughput()
+
+    def information(sessionupload, sessiondownload, uploadspeed=0, downloadspeed=0):
+        return InformationRecord.from_attrib({"sessionupload": str(sessionupload),
+                                              "sessiondownload": str(sessiondownload),
+                                              "uploadspeed": str(uploadspeed),
+                                              "downloadspeed": str(downloadspeed)})
+
+    assert throughput.add(0.0, information(0, 0)) == {("throughput", "upload"), ("throughput", "download")}
+    assert throughput.add(1.0, information(0, 500, downloadspeed=500)) == {("throughput", "upload"),
+                                                                           ("throughput", "download")}
+    assert throughput.add(2.0, information(0, 1000, downloadspeed=500)) == {("throughput", "download")}